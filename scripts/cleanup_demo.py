@@ -23,11 +23,10 @@ CUSTOMERS = ["customer1", "customer2", "customer3"]
 TIMESTAMPS = [1767741427, 1767741527]
 
 
-def drop_alias(alias_name: str, driver):
-    """Drop a database alias."""
+def drop_alias(alias_name: str, session):
+    """Drop a database alias using an open system session."""
     try:
-        with driver.session(database="system") as session:
-            session.run(f"DROP ALIAS {alias_name} FOR DATABASE")
+        session.run("DROP ALIAS $alias FOR DATABASE", alias=alias_name)
         print(f"  ✅ Dropped alias: {alias_name}")
         return True
     except Exception as e:
@@ -39,11 +38,10 @@ def drop_alias(alias_name: str, driver):
         return False
 
 
-def drop_database(db_name: str, driver):
-    """Drop a database."""
+def drop_database(db_name: str, session):
+    """Drop a database using an open system session."""
     try:
-        with driver.session(database="system") as session:
-            session.run(f"DROP DATABASE `{db_name}` IF EXISTS")
+        session.run("DROP DATABASE $name IF EXISTS", name=db_name)
         print(f"  ✅ Dropped database: {db_name}")
         return True
     except Exception as e:
@@ -51,53 +49,88 @@ def drop_database(db_name: str, driver):
         return False
 
 
-def cleanup_all(config: dict, drop_aliases: bool = True, drop_databases: bool = True):
-    """Clean up all demo aliases and databases."""
-    driver = get_driver(config)
+def drop_all(session, alias_names: list, db_names: list) -> bool:
+    """
+    Drop aliases and databases in a single system-database transaction.
+    
+    Every statement is guarded with IF EXISTS so a missing alias or database
+    doesn't abort the rest of the batch.
+    """
+    def drop_work(tx):
+        for alias_name in alias_names:
+            tx.run("DROP ALIAS $alias IF EXISTS FOR DATABASE", alias=alias_name)
+        for db_name in db_names:
+            tx.run("DROP DATABASE $name IF EXISTS", name=db_name)
     
     try:
-        print("="*70)
-        print("CLEANUP: Blue/Green Deployment Demo")
-        print("="*70)
-        
-        if drop_aliases:
-            print("\n📋 Dropping aliases...")
-            for customer_id in CUSTOMERS:
-                drop_alias(customer_id, driver)
-        
-        if drop_databases:
-            print("\n🗄️  Dropping databases...")
-            for customer_id in CUSTOMERS:
-                for timestamp in TIMESTAMPS:
-                    db_name = f"{customer_id}-{timestamp}"
-                    drop_database(db_name, driver)
-        
-        print("\n" + "="*70)
-        print("✅ Cleanup complete!")
-        print("="*70)
-        
-    finally:
-        driver.close()
-
-
-def cleanup_customer(config: dict, customer_id: str, drop_alias_flag: bool = True):
+        session.execute_write(drop_work)
+    except Exception as e:
+        print(f"  ❌ Error during cleanup: {e}")
+        return False
+    
+    for alias_name in alias_names:
+        print(f"  ✅ Dropped alias: {alias_name}")
+    for db_name in db_names:
+        print(f"  ✅ Dropped database: {db_name}")
+    return True
+
+
+def cleanup_all(session, drop_aliases: bool = True, drop_databases: bool = True):
+    """Clean up all demo aliases and databases."""
+    print("="*70)
+    print("CLEANUP: Blue/Green Deployment Demo")
+    print("="*70)
+    
+    alias_names = list(CUSTOMERS) if drop_aliases else []
+    db_names = [
+        f"{customer_id}-{timestamp}"
+        for customer_id in CUSTOMERS
+        for timestamp in TIMESTAMPS
+    ] if drop_databases else []
+    
+    # Look up what actually exists once, so only those get dropped
+    if alias_names:
+        existing = {
+            record["name"]
+            for record in session.run(
+                "SHOW ALIASES FOR DATABASE YIELD name WHERE name IN $names RETURN name",
+                names=alias_names
+            )
+        }
+        alias_names = [name for name in alias_names if name in existing]
+    if db_names:
+        existing = {
+            record["name"]
+            for record in session.run(
+                "SHOW DATABASES YIELD name WHERE name IN $names RETURN name",
+                names=db_names
+            )
+        }
+        db_names = [name for name in db_names if name in existing]
+    
+    if alias_names or db_names:
+        print("\n🗄️  Dropping aliases and databases...")
+        drop_all(session, alias_names, db_names)
+    else:
+        print("\nNothing to clean up.")
+    
+    print("\n" + "="*70)
+    print("✅ Cleanup complete!")
+    print("="*70)
+
+
+def cleanup_customer(session, customer_id: str, drop_alias_flag: bool = True):
     """Clean up a specific customer's aliases and databases."""
-    driver = get_driver(config)
+    print(f"\n🧹 Cleaning up {customer_id}...")
     
-    try:
-        print(f"\n🧹 Cleaning up {customer_id}...")
-        
-        if drop_alias_flag:
-            drop_alias(customer_id, driver)
-        
-        for timestamp in TIMESTAMPS:
-            db_name = f"{customer_id}-{timestamp}"
-            drop_database(db_name, driver)
-        
-        print(f"✅ {customer_id} cleanup complete")
-        
-    finally:
-        driver.close()
+    if drop_alias_flag:
+        drop_alias(customer_id, session)
+    
+    for timestamp in TIMESTAMPS:
+        db_name = f"{customer_id}-{timestamp}"
+        drop_database(db_name, session)
+    
+    print(f"✅ {customer_id} cleanup complete")
 
 
 def main():
@@ -114,48 +147,40 @@ def main():
     config_path = project_root / args.config
     config = load_config(config_path)
     
+    # One driver and one system session for the whole run
     driver = get_driver(config)
     
-    if args.list:
-        print("\n📋 Current aliases:")
-        print("-" * 70)
-        try:
-            with driver.session(database="system") as session:
-                result = session.run("SHOW ALIASES FOR DATABASE")
-                records = list(result)
-                if not records:
+    with driver.session(database="system") as session:
+        if args.list:
+            print("\n📋 Current aliases:")
+            print("-" * 70)
+            try:
+                shown = False
+                for record in session.run("SHOW ALIASES FOR DATABASE"):
+                    print(f"  {record.get('name', ''):20} -> {record.get('database', '')}")
+                    shown = True
+                if not shown:
                     print("  (none)")
-                else:
-                    for record in records:
-                        print(f"  {record.get('name', ''):20} -> {record.get('database', '')}")
-        except Exception as e:
-            print(f"  Error: {e}")
-        
-        print("\n🗄️  Demo databases:")
-        print("-" * 70)
-        try:
-            with driver.session(database="system") as session:
+            except Exception as e:
+                print(f"  Error: {e}")
+            
+            print("\n🗄️  Demo databases:")
+            print("-" * 70)
+            try:
                 result = session.run("SHOW DATABASES YIELD name WHERE name <> 'system' AND name <> 'neo4j' RETURN name ORDER BY name")
-                records = list(result)
-                demo_dbs = [r['name'] for r in records if any(c in r['name'] for c in CUSTOMERS)]
-                if not demo_dbs:
+                shown = False
+                for record in result:
+                    if any(c in record['name'] for c in CUSTOMERS):
+                        print(f"  {record['name']}")
+                        shown = True
+                if not shown:
                     print("  (none)")
-                else:
-                    for db_name in demo_dbs:
-                        print(f"  {db_name}")
-        except Exception as e:
-            print(f"  Error: {e}")
-        
-        driver.close()
-        return
-    
-    try:
-        if args.customer:
-            cleanup_customer(config, args.customer, not args.no_aliases)
+            except Exception as e:
+                print(f"  Error: {e}")
+        elif args.customer:
+            cleanup_customer(session, args.customer, not args.no_aliases)
         else:
-            cleanup_all(config, not args.no_aliases, not args.no_databases)
-    finally:
-        driver.close()
+            cleanup_all(session, not args.no_aliases, not args.no_databases)
 
 
 if __name__ == "__main__":
@@ -6,6 +6,8 @@ Loads all 6 datasets and demonstrates alias switching.
 import sys
 import yaml
 import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 # Add project root and src directory to path for imports
@@ -14,7 +16,8 @@ src_path = project_root / "src"
 sys.path.insert(0, str(src_path))
 sys.path.insert(0, str(project_root))
 
-from scripts.load_with_aliases import load_and_switch, set_alias
+from scripts.load_with_aliases import load_and_switch, set_aliases_bulk
+from blue_green_etl.neo4j_utils import get_driver
 from blue_green_etl.logging_config import setup_logging, get_logger
 from blue_green_etl.config_loader import load_config
 
@@ -26,13 +29,85 @@ logger = get_logger(__name__)
 CUSTOMERS = ["customer1", "customer2", "customer3"]
 TIMESTAMPS = [1767741427, 1767741527]
 
+
+def load_phase(timestamp: int, config: dict, data_base_path: Path, switch_alias: bool, parallel: int = 1):
+    """
+    Load every demo customer for one timestamp.
+    
+    With parallel > 1 the customers are loaded concurrently; each load uses its
+    own Arrow client, so there is no shared state between the jobs.
+    Yields (customer_id, result) as loads complete.
+    """
+    if parallel <= 1:
+        for customer_id in CUSTOMERS:
+            logger.info("📦 Loading %s...", customer_id)
+            yield customer_id, load_and_switch(
+                customer_id,
+                timestamp,
+                config,
+                data_base_path,
+                switch_alias=switch_alias
+            )
+        return
+    
+    logger.info("📦 Loading %d customers (%d at a time)...", len(CUSTOMERS), parallel)
+    with ThreadPoolExecutor(max_workers=min(parallel, len(CUSTOMERS))) as executor:
+        futures = {
+            executor.submit(
+                load_and_switch,
+                customer_id,
+                timestamp,
+                config,
+                data_base_path,
+                switch_alias=switch_alias
+            ): customer_id
+            for customer_id in CUSTOMERS
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def _read_alias_status(tx, customers: list) -> tuple:
+    """
+    Read where the customer aliases point and which of those targets are online.
+    
+    Both SHOW commands filter server-side, so only the customer aliases and
+    their targets come back rather than every alias and database.
+    
+    Returns:
+        (alias name -> target database, set of online target databases)
+    """
+    alias_targets = {
+        record["name"]: record["database"]
+        for record in tx.run(
+            "SHOW ALIASES FOR DATABASE YIELD name, database WHERE name IN $names RETURN name, database",
+            names=customers
+        )
+    }
+    online_targets = {
+        record["name"]
+        for record in tx.run(
+            "SHOW DATABASES YIELD name, currentStatus "
+            "WHERE name IN $targets AND currentStatus = 'online' RETURN name",
+            targets=list(alias_targets.values())
+        )
+    }
+    return alias_targets, online_targets
+
+
 def main():
     """Run complete demo workflow."""
+    parser = argparse.ArgumentParser(description="Run the blue/green deployment demo")
+    parser.add_argument("--parallel", type=int, default=1,
+                        help="Number of customers to load concurrently (default: 1, serial)")
+    args = parser.parse_args()
+    
     # Load config (from project root)
     config_path = project_root / "config.yaml"
     config = load_config(config_path)
     
-    data_base_path = project_root / "data"
+    # Resolved once; every load in every phase joins onto it
+    data_base_path = (project_root / "data").resolve()
     
     logger.info("="*70)
     logger.info("BLUE/GREEN DEPLOYMENT DEMO")
@@ -45,72 +120,35 @@ def main():
     logger.info("PHASE 1: Initial Deployments (Blue)")
     logger.info("="*70)
     
-    for customer_id in CUSTOMERS:
-        timestamp = TIMESTAMPS[0]  # First timestamp = blue
-        logger.info(f"📦 Loading {customer_id} (blue deployment)...")
-        result = load_and_switch(
-            customer_id,
-            timestamp,
-            config,
-            data_base_path,
-            switch_alias=True
-        )
-        logger.info(f"   ✅ {customer_id} alias now points to {result['database']}")
+    # First timestamp = blue
+    for customer_id, result in load_phase(TIMESTAMPS[0], config, data_base_path,
+                                          switch_alias=True, parallel=args.parallel):
+        logger.info("   ✅ %s alias now points to %s", customer_id, result['database'])
     
     # Phase 2: Load new deployments (green) without switching
     logger.info("="*70)
     logger.info("PHASE 2: New Deployments (Green) - Loaded but not active")
     logger.info("="*70)
     
-    for customer_id in CUSTOMERS:
-        timestamp = TIMESTAMPS[1]  # Second timestamp = green
-        logger.info(f"📦 Loading {customer_id} (green deployment)...")
-        result = load_and_switch(
-            customer_id,
-            timestamp,
-            config,
-            data_base_path,
-            switch_alias=False  # Don't switch yet
-        )
-        logger.info(f"   ✅ {result['database']} loaded (alias still points to blue)")
+    # Second timestamp = green, don't switch yet
+    for customer_id, result in load_phase(TIMESTAMPS[1], config, data_base_path,
+                                          switch_alias=False, parallel=args.parallel):
+        logger.info("   ✅ %s loaded (alias still points to blue)", result['database'])
     
     # Phase 3: Demonstrate cutover - switch all aliases to latest (highest timestamp) deployments
     logger.info("="*70)
     logger.info("PHASE 3: Cutover - Switching All Aliases to Latest Deployments")
     logger.info("="*70)
     
-    for customer_id in CUSTOMERS:
-        latest_db = f"{customer_id}-{TIMESTAMPS[1]}"  # Highest timestamp = latest
-        logger.info(f"Switching {customer_id} alias to latest deployment ({latest_db})...")
-        set_alias(customer_id, latest_db, config)
-    
-    # Get actual alias targets and database statuses from Neo4j
-    import neo4j
-    neo4j_url = f"bolt://{config['neo4j']['host']}:{config['neo4j']['bolt_port']}"
-    driver = neo4j.GraphDatabase.driver(
-        neo4j_url,
-        auth=neo4j.basic_auth(config['neo4j']['user'], config['neo4j']['password'])
-    )
-    
-    alias_targets = {}
-    db_statuses = {}
-    try:
-        with driver.session(database="system") as session:
-            # Get alias targets
-            result = session.run("SHOW ALIASES FOR DATABASE")
-            for record in result:
-                alias_name = record.get('name', '')
-                target_db = record.get('database', '')
-                alias_targets[alias_name] = target_db
-            
-            # Get database statuses (online/offline)
-            result = session.run("SHOW DATABASES YIELD name, currentStatus WHERE name <> 'system' RETURN name, currentStatus")
-            for record in result:
-                db_name = record.get('name', '')
-                status = record.get('currentStatus', '')
-                db_statuses[db_name] = status
-    finally:
-        driver.close()
+    # Highest timestamp = latest; all aliases switch together in one transaction
+    latest = {customer_id: f"{customer_id}-{TIMESTAMPS[1]}" for customer_id in CUSTOMERS}
+    logger.info("Switching %s aliases to latest deployments...", ", ".join(latest))
+    driver = get_driver(config)
+    with driver.session(database="system") as session:
+        set_aliases_bulk(latest, session)
+        
+        # Get actual alias targets and which of them are online, in one read transaction
+        alias_targets, online_targets = session.execute_read(_read_alias_status, CUSTOMERS)
     
     logger.info("="*70)
     logger.info("SUMMARY")
@@ -119,17 +157,15 @@ def main():
     for customer_id in CUSTOMERS:
         for timestamp in TIMESTAMPS:
             db_name = f"{customer_id}-{timestamp}"
-            # Check if this database is the target of an alias AND is online
-            is_alias_target = alias_targets.get(customer_id) == db_name
-            is_online = db_statuses.get(db_name) == 'online'
-            is_active = is_alias_target and is_online
+            # Active means this database is the target of an alias AND is online
+            is_active = alias_targets.get(customer_id) == db_name and db_name in online_targets
             status = "🟢 ACTIVE" if is_active else "🔵 INACTIVE"
-            logger.info(f"  {db_name:30} {status}")
+            logger.info("  %-30s %s", db_name, status)
     
     logger.info("Aliases:")
     for customer_id in CUSTOMERS:
         active_db = alias_targets.get(customer_id, "(not found)")
-        logger.info(f"  {customer_id:30} -> {active_db}")
+        logger.info("  %-30s -> %s", customer_id, active_db)
     
     logger.info("="*70)
     logger.info("✅ Demo complete!")
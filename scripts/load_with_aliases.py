@@ -7,6 +7,7 @@ This script:
 2. Creates/updates an alias pointing to that database (e.g., customer1 -> customer1-1767741427)
 3. Supports blue/green deployment pattern
 """
+import os
 import sys
 import yaml
 import time
@@ -26,77 +27,84 @@ from blue_green_etl import neo4j_arrow_client as na
 from blue_green_etl.neo4j_utils import get_driver
 from blue_green_etl.logging_config import get_logger
 from blue_green_etl.config_loader import load_config
-import neo4j
 
 # Set up logging
 logger = get_logger(__name__)
 
 
-def load_database(
-    customer_id: str,
-    timestamp: int,
-    config: dict,
-    data_path: Path
-) -> dict:
+def _wait_dropped(session, db_name: str, timeout: float = 5.0, interval: float = 0.05) -> bool:
     """
-    Load data to a timestamped database using Arrow protocol.
+    Poll the system database until db_name is no longer listed.
     
     Returns:
-        dict with node_count and relationship_count
+        True once the database is gone, False if it is still listed after timeout seconds
     """
-    # Database name is customer_id + timestamp (use dash, not underscore - Neo4j doesn't allow underscores)
-    db_name = f"{customer_id}-{timestamp}"
-    
-    logger.info(f"{'='*60}")
-    logger.info(f"Loading {customer_id} data to database: {db_name}")
-    logger.info(f"{'='*60}")
-    
-    # First, try to drop existing database if it exists (using Neo4j driver directly)
-    # This cleans up any stuck Arrow processes associated with the database
-    # We use the Neo4j driver directly (not GDS) because GDS can't run in system database
-    logger.info(f"Checking for existing database...")
-    driver = get_driver(config)
-    try:
-        with driver.session(database="system") as session:
-            # Check if database exists
-            result = session.run(f"SHOW DATABASES YIELD name WHERE name = '{db_name}' RETURN name")
-            if result.single():
-                logger.info(f"Dropping existing database {db_name} (this will clean up any stuck Arrow processes)...")
-                
-                # First, check if there are any aliases pointing to this database and drop them
-                alias_result = session.run("SHOW ALIASES FOR DATABASE")
-                for record in alias_result:
-                    alias_name = record.get('name', '')
-                    alias_target = record.get('database', '')
-                    if alias_target == db_name:
-                        logger.info(f"  Dropping alias {alias_name} that points to {db_name}...")
-                        try:
-                            session.run(f"DROP ALIAS {alias_name} FOR DATABASE")
-                            logger.info(f"  ✅ Dropped alias {alias_name}")
-                        except Exception as e:
-                            logger.warning(f"  ⚠️  Could not drop alias {alias_name}: {e}")
-                
-                # Now drop the database (use backticks around database name since it contains dashes)
-                session.run(f"DROP DATABASE `{db_name}` IF EXISTS")
-                # Give Neo4j a moment to clean up
-                time.sleep(2)  # Increased wait time for cleanup
-                logger.info(f"✅ Dropped existing database")
-    except Exception as e:
-        logger.info(f"Note: Could not check/drop database (may not exist): {e}")
-    finally:
-        driver.close()
+    deadline = time.monotonic() + timeout
+    while True:
+        record = session.run(
+            "SHOW DATABASES YIELD name WHERE name = $n RETURN count(*) AS c",
+            n=db_name
+        ).single()
+        if not record or record["c"] == 0:
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+
+
+def _reset_db(tx, db_name: str) -> tuple:
+    """
+    Drop db_name and any aliases pointing at it within one transaction.
     
-    # Create Arrow client
-    client = na.Neo4jArrowClient(
-        host=config['neo4j']['host'],
-        port=config['neo4j']['arrow_port'],
-        user=config['neo4j']['user'],
-        password=config['neo4j']['password'],
-        tls=config['neo4j']['tls'],
-        concurrency=config['neo4j']['concurrency'],
-        database=db_name
-    )
+    Returns:
+        (names of the aliases that were dropped, whether the database existed)
+    """
+    alias_names = [
+        record["name"]
+        for record in tx.run(
+            "SHOW ALIASES FOR DATABASE YIELD name, database WHERE database = $d RETURN name",
+            d=db_name
+        )
+    ]
+    for alias_name in alias_names:
+        tx.run("DROP ALIAS $alias FOR DATABASE", alias=alias_name)
+    # IF EXISTS makes a separate existence check unnecessary and the update
+    # counter tells us if it was there
+    summary = tx.run("DROP DATABASE $name IF EXISTS", name=db_name).consume()
+    return alias_names, summary.counters.system_updates > 0
+
+
+def _sum_results(results) -> tuple:
+    """Total (rows, bytes) across fan_out results in a single pass."""
+    total_rows = total_bytes = 0
+    for x in results:
+        total_rows += x["rows"]
+        total_bytes += x["bytes"]
+    return total_rows, total_bytes
+
+
+def _prepare_fresh_db(db_name: str, session):
+    """Drop db_name and its aliases and wait until Neo4j has removed it."""
+    logger.info("Dropping any existing %s (this will clean up any stuck Arrow processes)...", db_name)
+    # Aliases and database are dropped in one transaction
+    dropped_aliases, dropped_db = session.execute_write(_reset_db, db_name)
+    if dropped_db:
+        aliases_note = f" and alias(es) {', '.join(dropped_aliases)}" if dropped_aliases else ""
+        logger.info("✅ Dropped existing database %s%s", db_name, aliases_note)
+        # Wait until Neo4j has actually removed it rather than sleeping a fixed time
+        if not _wait_dropped(session, db_name):
+            logger.warning("⚠️  %s still listed after drop, continuing anyway", db_name)
+    else:
+        logger.info("No existing database %s to drop", db_name)
+
+
+def _arrow_load(client, db_name: str, config: dict, data_path: Path) -> dict:
+    """
+    Create db_name through the Arrow client and stream nodes then relationships into it.
     
+    Returns:
+        dict with database, node_count and relationship_count
+    """
     # Abort any existing stuck Arrow process for this database
     # (Silently handle if no process exists)
     try:
@@ -116,11 +124,11 @@ def load_database(
     }
     
     msg = client.create_database(config=import_config)
-    logger.info(f"✅ Database {db_name} created")
+    logger.info("✅ Database %s created", db_name)
     
     # Load nodes
     nodes_path = data_path / "nodes"
-    logger.info(f"Loading nodes from {nodes_path}...")
+    logger.info("Loading nodes from %s...", nodes_path)
     node_results, node_timing = npq.fan_out(
         client,
         str(nodes_path),
@@ -128,8 +136,7 @@ def load_database(
         config['worker']['concurrency']
     )
     
-    total_nodes = sum([x["rows"] for x in node_results])
-    total_bytes = sum([x["bytes"] for x in node_results])
+    total_nodes, total_bytes = _sum_results(node_results)
     node_rate = int(total_nodes / node_timing) if node_timing > 0 else 0
     data_rate = int(total_bytes / node_timing) >> 20 if node_timing > 0 else 0
     
@@ -143,7 +150,7 @@ def load_database(
     
     # Load relationships
     relationships_path = data_path / "relationships"
-    logger.info(f"Loading relationships from {relationships_path}...")
+    logger.info("Loading relationships from %s...", relationships_path)
     edge_results, edge_timing = npq.fan_out(
         client,
         str(relationships_path),
@@ -151,8 +158,7 @@ def load_database(
         config['worker']['concurrency']
     )
     
-    total_edges = sum([x["rows"] for x in edge_results])
-    total_bytes = sum([x["bytes"] for x in edge_results])
+    total_edges, total_bytes = _sum_results(edge_results)
     edge_rate = int(total_edges / edge_timing) if edge_timing > 0 else 0
     data_rate = int(total_bytes / edge_timing) >> 20 if edge_timing > 0 else 0
     
@@ -165,7 +171,7 @@ def load_database(
     logger.info(f"✅ Relationships complete: {relationship_count:,} relationships")
     
     # Cleanup
-    client.client = None
+    client.close()
     
     return {
         "database": db_name,
@@ -174,6 +180,78 @@ def load_database(
     }
 
 
+def load_database(
+    customer_id: str,
+    timestamp: int,
+    config: dict,
+    data_path: Path
+) -> dict:
+    """
+    Load data to a timestamped database using Arrow protocol.
+    
+    Returns:
+        dict with node_count and relationship_count
+    """
+    # Database name is customer_id + timestamp (use dash, not underscore - Neo4j doesn't allow underscores)
+    db_name = f"{customer_id}-{timestamp}"
+    
+    logger.info(f"{'='*60}")
+    logger.info("Loading %s data to database: %s", customer_id, db_name)
+    logger.info(f"{'='*60}")
+    
+    # First, try to drop existing database if it exists (using Neo4j driver directly)
+    # This cleans up any stuck Arrow processes associated with the database
+    # We use the Neo4j driver directly (not GDS) because GDS can't run in system database
+    # The session is closed (its connection back in the pool) before the Arrow load starts
+    try:
+        with get_driver(config).session(database="system") as session:
+            _prepare_fresh_db(db_name, session)
+    except Exception as e:
+        logger.info("Note: Could not check/drop database (may not exist): %s", e)
+    
+    # Create Arrow client
+    client = na.Neo4jArrowClient(
+        host=config['neo4j']['host'],
+        port=config['neo4j']['arrow_port'],
+        user=config['neo4j']['user'],
+        password=config['neo4j']['password'],
+        tls=config['neo4j']['tls'],
+        concurrency=config['neo4j']['concurrency'],
+        database=db_name
+    )
+    
+    return _arrow_load(client, db_name, config, data_path)
+
+
+def _switch_aliases(tx, mapping: dict):
+    for alias_name, target_database in mapping.items():
+        # Creates or repoints the alias in one statement
+        tx.run("CREATE OR REPLACE ALIAS $alias FOR DATABASE $target", alias=alias_name, target=target_database)
+
+
+def set_aliases_bulk(mapping: dict, session) -> bool:
+    """
+    Point several aliases at their target databases in one system transaction.
+    
+    Args:
+        mapping: Alias name -> target database name
+        session: Open session on the system database
+    
+    Returns:
+        True if every alias was switched, False if the transaction failed
+        (in which case none of them were)
+    """
+    try:
+        session.execute_write(_switch_aliases, mapping)
+        
+        for alias_name, target_database in mapping.items():
+            logger.info("✅ Alias '%s' now points to '%s'", alias_name, target_database)
+        return True
+    except Exception as e:
+        logger.error("❌ Error setting aliases: %s", e)
+        return False
+
+
 def set_alias(
     alias_name: str,
     target_database: str,
@@ -183,34 +261,16 @@ def set_alias(
     Set a database alias to point to a target database.
     Uses Neo4j driver directly (not GDS) because GDS can't run in system database.
     """
-    logger.info(f"Setting alias '{alias_name}' -> '{target_database}'...")
+    logger.info("Setting alias '%s' -> '%s'...", alias_name, target_database)
     
     # Use Neo4j driver directly for alias management (GDS can't run in system database)
-    neo4j_url = f"bolt://{config['neo4j']['host']}:{config['neo4j']['bolt_port']}"
-    driver = neo4j.GraphDatabase.driver(
-        neo4j_url,
-        auth=neo4j.basic_auth(config['neo4j']['user'], config['neo4j']['password'])
-    )
-    
+    driver = get_driver(config)
     try:
         with driver.session(database="system") as session:
-            # Try to drop alias if it exists (ignore error if it doesn't exist)
-            try:
-                session.run(f"DROP ALIAS {alias_name} FOR DATABASE")
-            except Exception:
-                pass  # Alias doesn't exist, that's fine
-            
-            # Create new alias (use backticks for database names with dashes)
-            create_query = f"CREATE ALIAS {alias_name} FOR DATABASE `{target_database}`"
-            session.run(create_query)
-        
-        logger.info(f"✅ Alias '{alias_name}' now points to '{target_database}'")
-        return True
+            return set_aliases_bulk({alias_name: target_database}, session)
     except Exception as e:
-        logger.error(f"❌ Error setting alias: {e}")
+        logger.error("❌ Error setting alias: %s", e)
         return False
-    finally:
-        driver.close()
 
 
 def load_and_switch(
@@ -228,6 +288,7 @@ def load_and_switch(
         timestamp: Timestamp for this deployment (e.g., 1767741427)
         config: Configuration dictionary
         data_base_path: Base path containing customer/timestamp directories
+            (resolve it once up front when loading many snapshots)
         switch_alias: If True, switch the alias to point to the new database
     
     Returns:
@@ -235,7 +296,7 @@ def load_and_switch(
     """
     data_path = data_base_path / customer_id / str(timestamp)
     
-    if not data_path.exists():
+    if not os.path.isdir(data_path):
         raise FileNotFoundError(f"Data path not found: {data_path}")
     
     # Load the database
@@ -266,7 +327,7 @@ def main():
     config = load_config(config_path)
     
     # Data path (from project root)
-    data_base_path = project_root / args.data_path
+    data_base_path = (project_root / args.data_path).resolve()
     
     # Load and switch
     result = load_and_switch(
@@ -18,27 +18,32 @@ from blue_green_etl.neo4j_utils import get_driver
 from blue_green_etl.config_loader import load_config
 
 
-def list_aliases(config: dict):
-    """List all database aliases."""
+def list_aliases(config: dict, return_list: bool = True):
+    """
+    List all database aliases.
+    
+    Records are printed as they stream in and returned as a list; pass
+    return_list=False to skip collecting them (returns None).
+    """
     driver = get_driver(config)
-    try:
-        with driver.session(database="system") as session:
-            # SHOW ALIASES FOR DATABASE shows all aliases
-            result = session.run("SHOW ALIASES FOR DATABASE")
-            records = list(result)
-            if not records:
-                print("No aliases found.")
-            else:
+    records = [] if return_list else None
+    shown = False
+    with driver.session(database="system") as session:
+        # SHOW ALIASES FOR DATABASE shows all aliases
+        for record in session.run("SHOW ALIASES FOR DATABASE"):
+            if not shown:
                 print("\nCurrent aliases:")
                 print("-" * 60)
-                for record in records:
-                    # SHOW ALIASES FOR DATABASE returns: name, database, location
-                    alias_name = record.get('name', '')
-                    target_db = record.get('database', '')
-                    print(f"  {alias_name:20} -> {target_db}")
-            return records
-    finally:
-        driver.close()
+                shown = True
+            # SHOW ALIASES FOR DATABASE returns: name, database, location
+            alias_name = record.get('name', '')
+            target_db = record.get('database', '')
+            print(f"  {alias_name:20} -> {target_db}")
+            if return_list:
+                records.append(record)
+    if not shown:
+        print("No aliases found.")
+    return records
 
 
 def create_alias(alias_name: str, target_database: str, config: dict):
@@ -46,22 +51,18 @@ def create_alias(alias_name: str, target_database: str, config: dict):
     driver = get_driver(config)
     try:
         with driver.session(database="system") as session:
-            # Try to drop if exists (ignore error if it doesn't exist)
-            try:
-                session.run(f"DROP ALIAS {alias_name} FOR DATABASE")
-            except Exception:
-                pass  # Alias doesn't exist, that's fine
-            
-            # Create new alias (use backticks for database names with dashes)
-            session.run(f"CREATE ALIAS {alias_name} FOR DATABASE `{target_database}`")
+            # Creates or repoints the alias in one statement
+            session.run(
+                "CREATE OR REPLACE ALIAS $alias FOR DATABASE $target",
+                alias=alias_name,
+                target=target_database
+            )
         
         print(f"✅ Alias '{alias_name}' -> '{target_database}'")
         return True
     except Exception as e:
         print(f"❌ Error: {e}")
         return False
-    finally:
-        driver.close()
 
 
 def drop_alias(alias_name: str, config: dict):
@@ -69,40 +70,44 @@ def drop_alias(alias_name: str, config: dict):
     driver = get_driver(config)
     try:
         with driver.session(database="system") as session:
-            session.run(f"DROP ALIAS {alias_name} FOR DATABASE")
+            session.run("DROP ALIAS $alias FOR DATABASE", alias=alias_name)
         print(f"✅ Alias '{alias_name}' dropped")
         return True
     except Exception as e:
         print(f"❌ Error: {e}")
         return False
-    finally:
-        driver.close()
 
 
-def list_databases(config: dict):
-    """List all databases."""
+def list_databases(config: dict, return_list: bool = True):
+    """
+    List all databases.
+    
+    Records are printed as they stream in and returned as a list; pass
+    return_list=False to skip collecting them (returns None).
+    """
     driver = get_driver(config)
-    try:
-        with driver.session(database="system") as session:
-            result = session.run("""
-                SHOW DATABASES
-                YIELD name, currentStatus, default
-                WHERE name <> 'system'
-                RETURN name, currentStatus, default
-                ORDER BY name
-            """)
-            records = list(result)
-            if not records:
-                print("No databases found.")
-            else:
+    records = [] if return_list else None
+    shown = False
+    with driver.session(database="system") as session:
+        result = session.run("""
+            SHOW DATABASES
+            YIELD name, currentStatus, default
+            WHERE name <> 'system'
+            RETURN name, currentStatus, default
+            ORDER BY name
+        """)
+        for record in result:
+            if not shown:
                 print("\nDatabases:")
                 print("-" * 60)
-                for record in records:
-                    default = " (default)" if record['default'] else ""
-                    print(f"  {record['name']:30} {record['currentStatus']}{default}")
-            return records
-    finally:
-        driver.close()
+                shown = True
+            default = " (default)" if record['default'] else ""
+            print(f"  {record['name']:30} {record['currentStatus']}{default}")
+            if return_list:
+                records.append(record)
+    if not shown:
+        print("No databases found.")
+    return records
 
 
 def main():
@@ -138,9 +143,9 @@ def main():
     
     # Execute command
     if args.command == "list-aliases":
-        list_aliases(config)
+        list_aliases(config, return_list=False)
     elif args.command == "list-databases":
-        list_databases(config)
+        list_databases(config, return_list=False)
     elif args.command == "create":
         create_alias(args.alias, args.database, config)
     elif args.command == "drop":
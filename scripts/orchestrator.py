@@ -9,17 +9,26 @@ This service:
 4. Cleans up old databases (keeps newest 2, removes older)
 5. Checks Neo4j health before loading
 """
+import heapq
+import itertools
+import os
+import signal
 import time
 import yaml
 import logging
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from queue import Queue, Empty
-from threading import Thread, Event, Lock
+from threading import Thread, Event, Lock, Condition, current_thread, main_thread
 import json
-import traceback
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Optional: faster status file serialization
 
 # Add project root and src directory to path for imports
 import sys
@@ -31,8 +40,9 @@ sys.path.insert(0, str(project_root))
 
 from scripts.load_with_aliases import load_database, set_alias
 from blue_green_etl.logging_config import setup_logging, get_logger
-from blue_green_etl.neo4j_utils import get_driver
-from blue_green_etl.config_loader import load_config
+from blue_green_etl.neo4j_utils import get_driver, close_drivers
+from blue_green_etl.config_loader import load_config, resolve_data_base_path
+from blue_green_etl.snapshot_utils import has_entries, is_timestamp
 
 # Set up logging with file output
 setup_logging()
@@ -50,37 +60,102 @@ class SnapshotTask:
     last_error: Optional[str] = None
 
 
+class SnapshotQueue(Queue):
+    """
+    Task queue that holds at most one task per (customer_id, timestamp).
+    
+    A snapshot counts as in flight from its first put() until a worker
+    release()s it after the final attempt. Putting a different task for an
+    in-flight snapshot is a no-op, while re-putting the same task object (health
+    check requeue, retry) is allowed.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self._in_flight: Dict[Tuple[str, int], SnapshotTask] = {}
+        self._in_flight_lock = Lock()
+    
+    def put(self, task: SnapshotTask, block: bool = True, timeout: Optional[float] = None):
+        key = (task.customer_id, task.timestamp)
+        with self._in_flight_lock:
+            if self._in_flight.setdefault(key, task) is not task:
+                logger.debug("Skipping duplicate task for %s/%s", task.customer_id, task.timestamp)
+                return
+        super().put(task, block, timeout)
+    
+    def release(self, task: SnapshotTask):
+        """Forget a task that won't be queued again (loaded, or out of retries)."""
+        with self._in_flight_lock:
+            self._in_flight.pop((task.customer_id, task.timestamp), None)
+
+
+@dataclass(slots=True)
+class OrchestratorSettings:
+    """Tuning values from the 'orchestrator' config section, read once at startup."""
+    max_retries: int = 3
+    retry_backoff_base: int = 2
+    max_databases: int = 50
+    heap_threshold_percent: float = 85
+    health_check_retry_delay: int = 60
+    shutdown_timeout: int = 300
+    health_check_ttl: float = 5
+    memory_check_ttl: float = 30
+    
+    @classmethod
+    def from_config(cls, config: dict) -> "OrchestratorSettings":
+        orch_config = config.get('orchestrator', {})
+        return cls(**{f.name: orch_config[f.name] for f in fields(cls) if f.name in orch_config})
+
+
 class Neo4jHealthChecker:
     """Checks Neo4j instance health before loading."""
     
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, settings: Optional[OrchestratorSettings] = None):
         self.config = config
+        self.settings = settings or OrchestratorSettings.from_config(config)
         self.neo4j_url = f"bolt://{config['neo4j']['host']}:{config['neo4j']['bolt_port']}"
         self.driver = get_driver(config)
+        # (checked_at, result) of the last check; workers share it for health_check_ttl
+        self._cached_health: Optional[Tuple[float, Tuple[bool, str]]] = None
+        self._cached_memory: Optional[Tuple[float, Optional[Tuple[bool, str]]]] = None
+        self._health_lock = Lock()
     
     def check_health(self) -> Tuple[bool, str]:
         """
         Check if Neo4j is healthy and ready for loading.
         Returns (is_healthy, message)
+        
+        The result is reused for health_check_ttl seconds, so a burst of tasks
+        across workers triggers one round of queries rather than one per task.
         """
+        with self._health_lock:
+            now = time.monotonic()
+            if self._cached_health and now - self._cached_health[0] < self.settings.health_check_ttl:
+                return self._cached_health[1]
+            result = self._run_health_check()
+            self._cached_health = (time.monotonic(), result)
+            return result
+    
+    def _run_health_check(self) -> Tuple[bool, str]:
         try:
-            with self.driver.session() as session:
+            # One system session serves the ping, the database count and the JMX queries
+            with self.driver.session(database="system") as session:
                 # Simple health check - can we query?
                 result = session.run("RETURN 1 AS health")
                 result.single()
                 
                 # Check database count (too many might indicate resource pressure)
-                result = self.driver.session(database="system").run(
+                result = session.run(
                     "SHOW DATABASES YIELD name WHERE name <> 'system' RETURN count(*) AS db_count"
                 )
                 db_count = result.single()['db_count']
                 
-                max_databases = self.config.get('orchestrator', {}).get('max_databases', 50)
+                max_databases = self.settings.max_databases
                 if db_count >= max_databases:
                     return False, f"Too many databases ({db_count} >= {max_databases})"
                 
                 # Check JVM memory usage (if available via JMX)
-                memory_status = self._check_memory()
+                memory_status = self._cached_memory_status(session)
                 if memory_status:
                     is_healthy, msg = memory_status
                     if not is_healthy:
@@ -90,7 +165,16 @@ class Neo4jHealthChecker:
         except Exception as e:
             return False, f"Health check failed: {e}"
     
-    def _check_memory(self) -> Optional[Tuple[bool, str]]:
+    def _cached_memory_status(self, session) -> Optional[Tuple[bool, str]]:
+        """_check_memory, reused for memory_check_ttl seconds since JMX queries are expensive."""
+        now = time.monotonic()
+        if self._cached_memory and now - self._cached_memory[0] < self.settings.memory_check_ttl:
+            return self._cached_memory[1]
+        status = self._check_memory(session)
+        self._cached_memory = (time.monotonic(), status)
+        return status
+    
+    def _check_memory(self, session) -> Optional[Tuple[bool, str]]:
         """
         Check both heap and pagecache memory usage via JMX query.
         
@@ -98,64 +182,64 @@ class Neo4jHealthChecker:
         - Heap: Used for Arrow protocol buffers, query execution, transaction state
         - Pagecache: Used for caching database pages (off-heap, managed by Neo4j)
         
-        Returns None if JMX not available, or (is_healthy, message) if available.
+        Runs on the caller's system session. Returns None if JMX not available,
+        or (is_healthy, message) if available.
         """
         try:
             # Try to query JMX for memory usage
             # This requires Enterprise Edition or specific JMX configuration
-            with self.driver.session(database="system") as session:
-                issues = []
-                
-                # Check heap memory (critical for Arrow operations)
-                try:
-                    result = session.run(
-                        "CALL dbms.queryJmx('java.lang:type=Memory') YIELD attributes "
-                        "WITH attributes['HeapMemoryUsage'] AS heap "
-                        "RETURN heap.used AS used, heap.max AS max, heap.committed AS committed"
-                    )
-                    record = result.single()
-                    if record:
-                        used = record['used']
-                        max_heap = record['max']
-                        if max_heap and max_heap > 0:
-                            heap_usage_percent = (used / max_heap) * 100
-                            
-                            # Get threshold from config (default 85%)
-                            heap_threshold = self.config.get('orchestrator', {}).get('heap_threshold_percent', 85)
-                            
-                            if heap_usage_percent >= heap_threshold:
-                                issues.append(f"heap: {heap_usage_percent:.1f}% (threshold: {heap_threshold}%)")
-                            
-                            logger.debug(f"JVM heap usage: {heap_usage_percent:.1f}% ({used:,} / {max_heap:,} bytes)")
-                except Exception:
-                    # Heap check not available - this is OK
-                    pass
-                
-                # Check pagecache (important for database capacity)
-                # Note: Pagecache monitoring via JMX is complex and varies by Neo4j version
-                # For now, we rely on heap monitoring as the primary indicator
-                # Pagecache is off-heap and managed separately by Neo4j
-                # If heap is healthy, pagecache is typically fine for Arrow loading
-                # Future enhancement: Parse pagecache metrics when structure is known
-                try:
-                    # Try to query pagecache - structure varies by version
-                    result = session.run(
-                        "CALL dbms.queryJmx('org.neo4j:instance=kernel#0,name=Page cache') YIELD attributes "
-                        "RETURN attributes"
-                    )
-                    record = result.single()
-                    if record:
-                        # Log that we found pagecache metrics (for future parsing)
-                        logger.debug(f"Pagecache metrics available (not yet parsed): {record}")
-                except Exception:
-                    # Pagecache check not available - this is OK, heap check is primary
-                    pass
-                
-                # If we found issues, return failure
-                if issues:
-                    return False, f"Memory usage too high - {', '.join(issues)}"
-                
-                return True, "Memory healthy"
+            issues = []
+            
+            # Check heap memory (critical for Arrow operations)
+            try:
+                result = session.run(
+                    "CALL dbms.queryJmx('java.lang:type=Memory') YIELD attributes "
+                    "WITH attributes['HeapMemoryUsage'] AS heap "
+                    "RETURN heap.used AS used, heap.max AS max, heap.committed AS committed"
+                )
+                record = result.single()
+                if record:
+                    used = record['used']
+                    max_heap = record['max']
+                    if max_heap and max_heap > 0:
+                        heap_usage_percent = (used / max_heap) * 100
+                        
+                        # Get threshold from config (default 85%)
+                        heap_threshold = self.settings.heap_threshold_percent
+                        
+                        if heap_usage_percent >= heap_threshold:
+                            issues.append(f"heap: {heap_usage_percent:.1f}% (threshold: {heap_threshold}%)")
+                        
+                        logger.debug(f"JVM heap usage: {heap_usage_percent:.1f}% ({used:,} / {max_heap:,} bytes)")
+            except Exception:
+                # Heap check not available - this is OK
+                pass
+            
+            # Check pagecache (important for database capacity)
+            # Note: Pagecache monitoring via JMX is complex and varies by Neo4j version
+            # For now, we rely on heap monitoring as the primary indicator
+            # Pagecache is off-heap and managed separately by Neo4j
+            # If heap is healthy, pagecache is typically fine for Arrow loading
+            # Future enhancement: Parse pagecache metrics when structure is known
+            try:
+                # Try to query pagecache - structure varies by version
+                result = session.run(
+                    "CALL dbms.queryJmx('org.neo4j:instance=kernel#0,name=Page cache') YIELD attributes "
+                    "RETURN attributes"
+                )
+                record = result.single()
+                if record:
+                    # Log that we found pagecache metrics (for future parsing)
+                    logger.debug(f"Pagecache metrics available (not yet parsed): {record}")
+            except Exception:
+                # Pagecache check not available - this is OK, heap check is primary
+                pass
+            
+            # If we found issues, return failure
+            if issues:
+                return False, f"Memory usage too high - {', '.join(issues)}"
+            
+            return True, "Memory healthy"
         except Exception:
             # JMX querying not available - this is OK for Community Edition
             pass
@@ -163,7 +247,8 @@ class Neo4jHealthChecker:
         return None  # Memory check not available, but that's OK
     
     def close(self):
-        self.driver.close()
+        # The driver is shared through get_driver and closed at shutdown, not per checker
+        pass
 
 
 class OrchestratorStats:
@@ -177,40 +262,87 @@ class OrchestratorStats:
         self.tasks_retried = 0
         self.start_time = datetime.now()
         self.last_activity = None
+        self.version = 0  # Bumped on every record_* so writers can skip unchanged stats
         
     def record_discovery(self):
         with self.lock:
             self.tasks_discovered += 1
             self.last_activity = datetime.now()
+            self.version += 1
     
     def record_completion(self):
         with self.lock:
             self.tasks_completed += 1
             self.last_activity = datetime.now()
+            self.version += 1
     
     def record_failure(self):
         with self.lock:
             self.tasks_failed += 1
             self.last_activity = datetime.now()
+            self.version += 1
     
     def record_retry(self):
         with self.lock:
             self.tasks_retried += 1
+            self.version += 1
     
     def to_dict(self) -> dict:
+        # Only copy the counters under the lock; formatting happens after release
         with self.lock:
-            uptime = (datetime.now() - self.start_time).total_seconds()
-            return {
-                'uptime_seconds': int(uptime),
-                'tasks_discovered': self.tasks_discovered,
-                'tasks_completed': self.tasks_completed,
-                'tasks_failed': self.tasks_failed,
-                'tasks_retried': self.tasks_retried,
-                'success_rate': (self.tasks_completed / max(self.tasks_discovered, 1)) * 100,
-                'queue_size': 0,  # Will be set by orchestrator
-                'last_activity': self.last_activity.isoformat() if self.last_activity else None,
-                'status': 'running'
-            }
+            discovered = self.tasks_discovered
+            completed = self.tasks_completed
+            failed = self.tasks_failed
+            retried = self.tasks_retried
+            last_activity = self.last_activity
+        
+        uptime = (datetime.now() - self.start_time).total_seconds()
+        return {
+            'uptime_seconds': int(uptime),
+            'tasks_discovered': discovered,
+            'tasks_completed': completed,
+            'tasks_failed': failed,
+            'tasks_retried': retried,
+            'success_rate': (completed / max(discovered, 1)) * 100,
+            'queue_size': 0,  # Will be set by orchestrator
+            'last_activity': last_activity.isoformat() if last_activity else None,
+            'status': 'running'
+        }
+
+
+# Runs the side queries workers overlap with their own system-db round trips.
+# Created on first use, so importing this module starts no threads
+_admin_query_pool: Optional[ThreadPoolExecutor] = None
+_admin_query_pool_lock = Lock()
+
+
+def _get_admin_query_pool() -> ThreadPoolExecutor:
+    """Return the shared admin-query pool, creating it on first use."""
+    global _admin_query_pool
+    with _admin_query_pool_lock:
+        if _admin_query_pool is None:
+            _admin_query_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="admin-query")
+        return _admin_query_pool
+
+
+def _shutdown_admin_query_pool():
+    """Shut down the admin-query pool if it was started; the next use starts a new one."""
+    global _admin_query_pool
+    with _admin_query_pool_lock:
+        pool, _admin_query_pool = _admin_query_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+def _write_json_atomic(path: Path, data: dict):
+    """Write data as JSON via a temp file and rename, so readers never see a partial file."""
+    tmp_path = path.with_suffix('.json.tmp')
+    if orjson is not None:
+        tmp_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
 
 
 class SnapshotWatcher:
@@ -221,56 +353,62 @@ class SnapshotWatcher:
         self.task_queue = task_queue
         self.stop_event = stop_event
         self.stats = stats
-        self.processed_snapshots: set = set()  # Track (customer_id, timestamp) we've seen
+        # Newest timestamp queued per customer. Snapshots only ever move forward, so
+        # anything at or below it has been handled (or superseded); memory stays
+        # O(customers) rather than growing with every snapshot seen
+        self.latest_discovered: Dict[str, int] = {}
     
     def scan_for_snapshots(self):
         """Scan for new snapshot directories."""
-        if not self.data_base_path.exists():
+        try:
+            customer_entries = os.scandir(self.data_base_path)
+        except FileNotFoundError:
             logger.warning(f"Data path does not exist: {self.data_base_path}")
             return
         
-        for customer_dir in self.data_base_path.iterdir():
-            if not customer_dir.is_dir():
-                continue
-            
-            customer_id = customer_dir.name
-            
-            # Look for timestamp directories
-            for timestamp_dir in customer_dir.iterdir():
-                if not timestamp_dir.is_dir():
-                    continue
-                
-                try:
-                    timestamp = int(timestamp_dir.name)
-                except ValueError:
+        with customer_entries:
+            for customer_entry in customer_entries:
+                if not customer_entry.is_dir():
                     continue
                 
-                # Check if we've already processed this
-                snapshot_key = (customer_id, timestamp)
-                if snapshot_key in self.processed_snapshots:
-                    continue
+                customer_id = customer_entry.name
+                watermark = self.latest_discovered.get(customer_id, -1)
+                complete = []
                 
-                # Check if snapshot is complete (has nodes and relationships)
-                nodes_path = timestamp_dir / "nodes"
-                relationships_path = timestamp_dir / "relationships"
+                # Look for timestamp directories
+                with os.scandir(customer_entry.path) as timestamp_entries:
+                    for timestamp_entry in timestamp_entries:
+                        if not is_timestamp(timestamp_entry.name):
+                            continue
+                        timestamp = int(timestamp_entry.name)
+                        
+                        # Check if we've already processed this before touching the filesystem again
+                        if timestamp <= watermark:
+                            continue
+                        
+                        if not timestamp_entry.is_dir():
+                            continue
+                        
+                        # Check if snapshot is complete (nodes and relationships both have content)
+                        if (has_entries(os.path.join(timestamp_entry.path, "nodes"))
+                                and has_entries(os.path.join(timestamp_entry.path, "relationships"))):
+                            complete.append((timestamp, timestamp_entry.path))
                 
-                if nodes_path.exists() and relationships_path.exists():
-                    # Check if nodes and relationships directories have content
-                    has_nodes = any(nodes_path.iterdir())
-                    has_relationships = any(relationships_path.iterdir())
-                    
-                    if has_nodes and has_relationships:
-                        task = SnapshotTask(
-                            customer_id=customer_id,
-                            timestamp=timestamp,
-                            data_path=timestamp_dir,
-                            created_at=datetime.now(),
-                            retry_count=0
-                        )
-                        self.task_queue.put(task)
-                        self.processed_snapshots.add(snapshot_key)
-                        self.stats.record_discovery()
-                        logger.info(f"📦 Discovered new snapshot: {customer_id}/{timestamp}")
+                # scandir order is arbitrary: queue oldest first and only then move
+                # the watermark, so every complete snapshot found in one scan is queued
+                for timestamp, path in sorted(complete):
+                    task = SnapshotTask(
+                        customer_id=customer_id,
+                        timestamp=timestamp,
+                        data_path=Path(path),
+                        created_at=datetime.now(),
+                        retry_count=0
+                    )
+                    self.task_queue.put(task)
+                    self.stats.record_discovery()
+                    logger.info(f"📦 Discovered new snapshot: {customer_id}/{timestamp}")
+                if complete:
+                    self.latest_discovered[customer_id] = max(complete)[0]
     
     def run(self, scan_interval: int = 30):
         """Continuously watch for new snapshots."""
@@ -286,16 +424,83 @@ class SnapshotWatcher:
             self.stop_event.wait(scan_interval)
 
 
+class RetryScheduler:
+    """
+    Re-queues failed tasks once their backoff has elapsed.
+    
+    One background thread serves every pending retry from a min-heap keyed
+    by due time, instead of a sleeping thread per failure. The thread is
+    started on the first schedule() call.
+    """
+    
+    def __init__(self, task_queue: Queue, stop_event: Event):
+        self.task_queue = task_queue
+        self.stop_event = stop_event
+        self._heap: List[Tuple[float, int, SnapshotTask]] = []
+        self._counter = itertools.count()  # Tie-breaker: tasks themselves aren't orderable
+        self._cond = Condition()
+        self._thread: Optional[Thread] = None
+    
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._heap)
+    
+    def schedule(self, task: SnapshotTask, delay: float):
+        """Put task back on the queue after delay seconds."""
+        with self._cond:
+            heapq.heappush(self._heap, (time.monotonic() + delay, next(self._counter), task))
+            self._cond.notify()
+            if self._thread is None:
+                self._thread = Thread(target=self.run, daemon=True)
+                self._thread.start()
+    
+    def run(self):
+        while not self.stop_event.is_set():
+            with self._cond:
+                now = time.monotonic()
+                if self._heap and self._heap[0][0] <= now:
+                    _, _, task = heapq.heappop(self._heap)
+                else:
+                    # Sleep until the next retry is due or a new one arrives; wake at
+                    # least once a second to notice stop_event
+                    timeout = min(self._heap[0][0] - now, 1.0) if self._heap else 1.0
+                    self._cond.wait(timeout)
+                    continue
+            self.task_queue.put(task)
+
+
+class LatestDeployments:
+    """
+    Newest deployed timestamp per customer, shared by all workers.
+    
+    Workers decide whether a load is the latest from here rather than from the
+    system database, which is only consulted the first time a customer is seen
+    (e.g. after a restart). Hold lock across the check and the alias switch so
+    two workers can't switch the same customer out of order.
+    """
+    
+    def __init__(self):
+        self.lock = Lock()
+        self.timestamps: Dict[str, int] = {}
+
+
 class LoadWorker:
     """Worker thread that processes loading tasks."""
     
-    def __init__(self, worker_id: int, task_queue: Queue, config: dict, health_checker: Neo4jHealthChecker, stats: OrchestratorStats):
+    def __init__(self, worker_id: int, task_queue: SnapshotQueue, config: dict, health_checker: Neo4jHealthChecker, stats: OrchestratorStats,
+                 settings: Optional[OrchestratorSettings] = None, retry_scheduler: Optional[RetryScheduler] = None,
+                 latest_deployments: Optional[LatestDeployments] = None):
         self.worker_id = worker_id
         self.task_queue = task_queue
         self.config = config
+        self.settings = settings or OrchestratorSettings.from_config(config)
         self.health_checker = health_checker
+        # Share the health checker's driver (and its connection pool)
+        self.driver = health_checker.driver
         self.stats = stats
         self.stop_event = Event()
+        self.retry_scheduler = retry_scheduler or RetryScheduler(task_queue, self.stop_event)
+        self.latest_deployments = latest_deployments or LatestDeployments()
     
     def load_snapshot(self, task: SnapshotTask) -> bool:
         """Load a snapshot and switch alias if it's the latest."""
@@ -318,28 +523,37 @@ class LoadWorker:
             result = load_database(customer_id, timestamp, self.config, task.data_path)
             logger.info(f"✅ Worker {self.worker_id}: Loaded {db_name} ({result['node_count']:,} nodes, {result['relationship_count']:,} relationships)")
             
+            # One look at the customer's databases and aliases serves both steps below
+            snapshot = self._load_db_snapshot(customer_id)
+            
             # Check if this is the latest timestamp for this customer
-            if self._is_latest_deployment(customer_id, timestamp):
-                logger.info(f"🔄 Worker {self.worker_id}: Switching {customer_id} alias to {db_name} (latest)")
-                set_alias(customer_id, db_name, self.config)
+            with self.latest_deployments.lock:
+                if self._is_latest_deployment(customer_id, timestamp, snapshot):
+                    logger.info(f"🔄 Worker {self.worker_id}: Switching {customer_id} alias to {db_name} (latest)")
+                    # A failed switch leaves the alias on the old database: retry like a failed load
+                    if not set_alias(customer_id, db_name, self.config):
+                        raise Exception(f"Could not switch alias {customer_id} to {db_name}")
+                    self.latest_deployments.timestamps[customer_id] = timestamp
+                    snapshot[1].add(db_name)
             
             # Cleanup old databases (keep newest 2)
-            self._cleanup_old_databases(customer_id)
+            self._cleanup_old_databases(customer_id, snapshot=snapshot)
             
             self.stats.record_completion()
+            self.task_queue.release(task)
             return True
             
         except Exception as e:
             error_msg = str(e)
-            error_trace = traceback.format_exc()
             task.last_error = error_msg
             
             logger.error(f"❌ Worker {self.worker_id}: Failed to load {db_name}: {error_msg}")
-            logger.debug(f"Full traceback:\n{error_trace}")
+            # exc_info lets logging format the traceback only if a DEBUG handler emits it
+            logger.debug("Full traceback:", exc_info=True)
             
             # Retry logic with exponential backoff
-            max_retries = self.config.get('orchestrator', {}).get('max_retries', 3)
-            retry_backoff_base = self.config.get('orchestrator', {}).get('retry_backoff_base', 2)
+            max_retries = self.settings.max_retries
+            retry_backoff_base = self.settings.retry_backoff_base
             
             if task.retry_count < max_retries:
                 task.retry_count += 1
@@ -348,80 +562,78 @@ class LoadWorker:
                 self.stats.record_retry()
                 
                 # Schedule retry with exponential backoff
-                def delayed_retry():
-                    time.sleep(backoff_seconds)
-                    if not self.stop_event.is_set():
-                        self.task_queue.put(task)
-                
-                retry_thread = Thread(target=delayed_retry, daemon=True)
-                retry_thread.start()
+                self.retry_scheduler.schedule(task, backoff_seconds)
             else:
                 logger.error(f"❌ Worker {self.worker_id}: Max retries exceeded for {db_name}. Marking as failed.")
                 self.stats.record_failure()
+                self.task_queue.release(task)
             
             return False
     
-    def _is_latest_deployment(self, customer_id: str, timestamp: int) -> bool:
+    def _load_db_snapshot(self, customer_id: str) -> Tuple[List[Tuple[int, str]], set]:
+        """
+        Fetch this customer's databases and the set of alias targets.
+        
+        The two queries run concurrently, each on its own system-db session.
+        
+        Returns:
+            ([(timestamp, db_name), ...], {database names that have an alias})
+        """
+        # The two SHOW commands are independent; fetch aliases on a helper thread
+        # so both round trips overlap
+        aliased_future = _get_admin_query_pool().submit(self._aliased_databases)
+        with self.driver.session(database="system") as session:
+            result = session.run(
+                "SHOW DATABASES YIELD name WHERE name STARTS WITH $prefix RETURN name",
+                prefix=f"{customer_id}-"
+            )
+            databases = []
+            for record in result:
+                db_name = record['name']
+                suffix = db_name.rpartition('-')[2]
+                if is_timestamp(suffix):
+                    databases.append((int(suffix), db_name))
+        return databases, aliased_future.result()
+    
+    def _aliased_databases(self) -> set:
+        """Names of all databases that an alias points to."""
+        with self.driver.session(database="system") as session:
+            return {
+                record['database']
+                for record in session.run("SHOW ALIASES FOR DATABASE YIELD database RETURN database")
+            }
+    
+    def _is_latest_deployment(self, customer_id: str, timestamp: int, snapshot=None) -> bool:
         """Check if this timestamp is the latest for this customer."""
-        # Get all databases for this customer
-        driver = get_driver(self.config)
-        try:
-            with driver.session(database="system") as session:
-                result = session.run(
-                    f"SHOW DATABASES YIELD name WHERE name STARTS WITH '{customer_id}-' RETURN name"
-                )
-                customer_timestamps = []
-                for record in result:
-                    db_name = record['name']
-                    try:
-                        db_timestamp = int(db_name.split('-')[-1])
-                        customer_timestamps.append(db_timestamp)
-                    except (ValueError, IndexError):
-                        continue
-                
-                return timestamp == max(customer_timestamps) if customer_timestamps else True
-        finally:
-            driver.close()
+        latest = self.latest_deployments.timestamps.get(customer_id)
+        if latest is None:
+            # First time we see this customer: take the newest database in Neo4j
+            databases, _ = snapshot or self._load_db_snapshot(customer_id)
+            latest = max(databases)[0] if databases else timestamp
+            self.latest_deployments.timestamps[customer_id] = latest
+        return timestamp >= latest
     
-    def _cleanup_old_databases(self, customer_id: str, keep_count: int = 2):
+    def _cleanup_old_databases(self, customer_id: str, keep_count: int = 2, snapshot=None):
         """Remove old databases, keeping only the newest N."""
-        driver = get_driver(self.config)
-        try:
-            with driver.session(database="system") as session:
-                # Get all databases for this customer with their timestamps
-                result = session.run(
-                    f"SHOW DATABASES YIELD name WHERE name STARTS WITH '{customer_id}-' RETURN name"
-                )
-                databases = []
-                for record in result:
-                    db_name = record['name']
-                    try:
-                        db_timestamp = int(db_name.split('-')[-1])
-                        databases.append((db_timestamp, db_name))
-                    except (ValueError, IndexError):
-                        continue
-                
-                # Sort by timestamp (newest first)
-                databases.sort(reverse=True)
-                
-                # Drop databases beyond keep_count
-                for db_timestamp, db_name in databases[keep_count:]:
-                    # Check if alias points to it first
-                    alias_result = session.run("SHOW ALIASES FOR DATABASE")
-                    has_alias = False
-                    for alias_record in alias_result:
-                        if alias_record.get('database') == db_name:
-                            has_alias = True
-                            break
-                    
-                    if not has_alias:
-                        logger.info(f"🗑️  Worker {self.worker_id}: Dropping old database {db_name}")
-                        try:
-                            session.run(f"DROP DATABASE `{db_name}` IF EXISTS")
-                        except Exception as e:
-                            logger.warning(f"⚠️  Could not drop {db_name}: {e}")
-        finally:
-            driver.close()
+        databases, aliased = snapshot or self._load_db_snapshot(customer_id)
+        
+        # Keep the newest keep_count (no full sort needed); skip anything an alias still points to
+        keep = {db_name for _, db_name in heapq.nlargest(keep_count, databases)}
+        to_drop = [
+            db_name for _, db_name in databases
+            if db_name not in keep and db_name not in aliased
+        ]
+        if not to_drop:
+            return
+        
+        with self.driver.session(database="system") as session:
+            for db_name in to_drop:
+                logger.info(f"🗑️  Worker {self.worker_id}: Dropping old database {db_name}")
+                try:
+                    # Name passed as a parameter so every drop shares one query text
+                    session.run("DROP DATABASE $name IF EXISTS", name=db_name)
+                except Exception as e:
+                    logger.warning(f"⚠️  Could not drop {db_name}: {e}")
     
     def run(self):
         """Process tasks from the queue."""
@@ -442,7 +654,7 @@ class LoadWorker:
                 
                 # If health check failed, wait before trying next task
                 if not success:
-                    retry_delay = self.config.get('orchestrator', {}).get('health_check_retry_delay', 60)
+                    retry_delay = self.settings.health_check_retry_delay
                     logger.info(f"Worker {self.worker_id}: Waiting {retry_delay}s before next task (database under pressure)")
                     self.stop_event.wait(retry_delay)
                     
@@ -451,6 +663,7 @@ class LoadWorker:
             except Exception as e:
                 logger.error(f"❌ Worker {self.worker_id}: Error processing task: {e}")
                 if 'task' in locals():
+                    self.task_queue.release(task)
                     self.task_queue.task_done()
         
         logger.info(f"🛑 Worker {self.worker_id} stopped")
@@ -466,33 +679,32 @@ class Orchestrator:
         self._validate_config()
         
         # Resolve base_path - if relative, make it relative to project root
-        base_path_str = self.config['dataset']['base_path']
-        if Path(base_path_str).is_absolute():
-            self.data_base_path = Path(base_path_str)
-        else:
-            # Relative path - resolve relative to project root
-            project_root = config_path.parent
-            self.data_base_path = project_root / base_path_str
+        project_root = config_path.parent
+        self.data_base_path = resolve_data_base_path(self.config, project_root)
         
         # Verify data path exists
         if not self.data_base_path.exists():
             raise FileNotFoundError(f"Data path does not exist: {self.data_base_path}")
         
-        self.task_queue = Queue()
+        self.task_queue = SnapshotQueue()
         self.stop_event = Event()
         self.stats = OrchestratorStats()
         self.status_file = project_root / "orchestrator_status.json"
+        self._status_version = None  # (stats version, queue size) last written
         
         orchestrator_config = self.config.get('orchestrator', {})
         self.num_workers = orchestrator_config.get('num_workers', 1)
         self.scan_interval = orchestrator_config.get('scan_interval', 30)
-        self.max_retries = orchestrator_config.get('max_retries', 3)
-        self.retry_backoff_base = orchestrator_config.get('retry_backoff_base', 2)
+        self.settings = OrchestratorSettings.from_config(self.config)
+        self.max_retries = self.settings.max_retries
+        self.retry_backoff_base = self.settings.retry_backoff_base
         
         # Test Neo4j connection before starting
         self._test_neo4j_connection()
         
-        self.health_checker = Neo4jHealthChecker(self.config)
+        self.health_checker = Neo4jHealthChecker(self.config, self.settings)
+        self.retry_scheduler = RetryScheduler(self.task_queue, self.stop_event)
+        self.latest_deployments = LatestDeployments()
         self.watcher = SnapshotWatcher(self.data_base_path, self.task_queue, self.stop_event, self.stats)
         self.workers: List[LoadWorker] = []
         self.status_update_thread = None
@@ -528,22 +740,26 @@ class Orchestrator:
             with driver.session() as session:
                 result = session.run("RETURN 1 AS test")
                 result.single()
-            driver.close()
             logger.info("✅ Neo4j connection successful")
         except Exception as e:
             raise ConnectionError(f"Failed to connect to Neo4j: {e}. Please check your configuration.")
     
     def _write_status_file(self):
-        """Write current status to JSON file for monitoring."""
+        """Write current status to JSON file for monitoring (skipped if nothing changed)."""
         try:
+            queue_size = self.task_queue.qsize()
+            version = (self.stats.version, queue_size)
+            if version == self._status_version:
+                return
+            
             status = self.stats.to_dict()
-            status['queue_size'] = self.task_queue.qsize()
+            status['queue_size'] = queue_size
             status['workers'] = self.num_workers
             status['scan_interval'] = self.scan_interval
             status['data_path'] = str(self.data_base_path)
             
-            with open(self.status_file, 'w') as f:
-                json.dump(status, f, indent=2)
+            _write_json_atomic(self.status_file, status)
+            self._status_version = version
         except Exception as e:
             logger.debug(f"Could not write status file: {e}")
     
@@ -563,7 +779,8 @@ class Orchestrator:
         
         # Start worker threads
         for i in range(self.num_workers):
-            worker = LoadWorker(i + 1, self.task_queue, self.config, self.health_checker, self.stats)
+            worker = LoadWorker(i + 1, self.task_queue, self.config, self.health_checker, self.stats,
+                                self.settings, self.retry_scheduler, self.latest_deployments)
             self.workers.append(worker)
             worker_thread = Thread(target=worker.run, daemon=True)
             worker_thread.start()
@@ -575,13 +792,24 @@ class Orchestrator:
         logger.info("✅ Orchestrator started. Press Ctrl+C to stop.")
         logger.info(f"📊 Status file: {self.status_file}")
         
-        try:
-            # Keep main thread alive
-            while True:
-                time.sleep(1)
-        except KeyboardInterrupt:
-            logger.info("\n🛑 Shutting down orchestrator...")
-            self.stop()
+        # Block until asked to stop; SIGINT/SIGTERM only set the event (signal
+        # handlers can only be installed from the main thread)
+        handle_signals = current_thread() is main_thread()
+        if handle_signals:
+            signal.signal(signal.SIGINT, self._request_stop)
+            signal.signal(signal.SIGTERM, self._request_stop)
+        self.stop_event.wait()
+        if handle_signals:
+            # A second Ctrl+C during shutdown forces it, as before
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        
+        logger.info("🛑 Shutting down orchestrator...")
+        self.stop()
+    
+    def _request_stop(self, signum, frame):
+        """Signal handler: wake the main thread in start() to shut down."""
+        self.stop_event.set()
     
     def _status_update_loop(self):
         """Periodically update status file."""
@@ -602,53 +830,37 @@ class Orchestrator:
             status = self.stats.to_dict()
             status['status'] = 'stopping'
             status['queue_size'] = self.task_queue.qsize()
-            with open(self.status_file, 'w') as f:
-                json.dump(status, f, indent=2)
+            _write_json_atomic(self.status_file, status)
         except Exception:
             pass
         
         # Wait for workers to finish current tasks (with timeout)
-        shutdown_timeout = self.config.get('orchestrator', {}).get('shutdown_timeout', 300)  # 5 minutes default
+        shutdown_timeout = self.settings.shutdown_timeout
         queue_size = self.task_queue.qsize()
         logger.info(f"Waiting for {queue_size} queued tasks to complete (timeout: {shutdown_timeout}s)...")
         
-        # Use threading-based timeout (works on all platforms)
-        import threading
-        
-        timeout_occurred = threading.Event()
-        
-        def timeout_handler():
-            timeout_occurred.wait(shutdown_timeout)
-            if not timeout_occurred.is_set() and self.task_queue.qsize() > 0:
-                logger.warning("⚠️  Shutdown timeout reached. Some tasks may not have completed.")
-                timeout_occurred.set()
-        
-        timeout_thread = threading.Thread(target=timeout_handler, daemon=True)
-        timeout_thread.start()
-        
+        # Queue.join() returns once every queued task has been marked done; run it
+        # in a helper thread so the wait can be bounded by shutdown_timeout
+        join_thread = Thread(target=self.task_queue.join, daemon=True)
+        join_thread.start()
         try:
-            # Wait for queue to empty or timeout
-            while self.task_queue.qsize() > 0 and not timeout_occurred.is_set():
-                time.sleep(0.5)
-            
-            if timeout_occurred.is_set():
+            join_thread.join(timeout=shutdown_timeout)
+            if join_thread.is_alive():
                 logger.warning("⚠️  Shutdown timeout reached. Some tasks may not have completed.")
             else:
                 logger.info("✅ All tasks completed")
         except KeyboardInterrupt:
             logger.warning("⚠️  Forced shutdown - some tasks may be incomplete")
-        finally:
-            timeout_occurred.set()  # Signal timeout thread to stop
         
-        self.health_checker.close()
+        _shutdown_admin_query_pool()
+        close_drivers()
         
         # Final status update
         try:
             status = self.stats.to_dict()
             status['status'] = 'stopped'
             status['queue_size'] = 0
-            with open(self.status_file, 'w') as f:
-                json.dump(status, f, indent=2)
+            _write_json_atomic(self.status_file, status)
         except Exception:
             pass
         
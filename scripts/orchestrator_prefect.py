@@ -11,10 +11,12 @@ Usage:
     3. Or serve flows: python scripts/orchestrator_prefect.py --serve
     4. View in UI: http://localhost:4200
 """
+import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 # Add project root and src directory to path for imports
@@ -24,19 +26,34 @@ sys.path.insert(0, str(src_path))
 sys.path.insert(0, str(project_root))
 
 from prefect import flow, task
-from prefect.tasks import task_input_hash
 import threading
 
 from scripts.load_with_aliases import load_database, set_alias
 from scripts.orchestrator import Neo4jHealthChecker
 from blue_green_etl.logging_config import setup_logging, get_logger
-from blue_green_etl.config_loader import load_config
-from blue_green_etl.neo4j_utils import get_driver
+from blue_green_etl.config_loader import load_config, resolve_data_base_path
+from blue_green_etl.neo4j_utils import get_driver, close_drivers
+from blue_green_etl.snapshot_utils import has_entries, is_timestamp
 
 # Set up logging
 setup_logging()
 logger = get_logger(__name__)
 
+# One health checker for every flow run, so its health/JMX result caches are
+# shared; created from the first config seen (the process serves one Neo4j)
+_health_checker: Optional[Neo4jHealthChecker] = None
+_health_checker_lock = threading.Lock()
+
+# A customer directory only counts as settled once its mtime is at least this
+# old, so a timestamp directory created in the same mtime tick as the listing
+# (coarse filesystem timestamps) still changes the mtime we compare against
+_SETTLE_MARGIN_NS = 2_000_000_000
+
+# SHOW DATABASES names shared across watcher scans: (expires at, names).
+# Dropped whenever this process creates or drops a database.
+_database_names_cache: Dict[str, Tuple[float, set]] = {}
+_database_names_lock = threading.Lock()
+
 
 @task(
     name="check-neo4j-health",
@@ -50,21 +67,18 @@ def check_health_task(config: dict) -> Tuple[bool, str]:
     Returns:
         (is_healthy, message)
     """
-    checker = Neo4jHealthChecker(config)
-    try:
-        is_healthy, message = checker.check_health()
-        return is_healthy, message
-    finally:
-        checker.close()
+    global _health_checker
+    with _health_checker_lock:
+        if _health_checker is None:
+            _health_checker = Neo4jHealthChecker(config)
+    return _health_checker.check_health()
 
 
 @task(
     name="load-database",
     retries=3,
     retry_delay_seconds=2,
-    log_prints=True,
-    cache_key_fn=task_input_hash,
-    cache_expiration=None  # Don't cache - always load fresh
+    log_prints=True
 )
 def load_database_task(
     customer_id: str,
@@ -102,38 +116,53 @@ def switch_alias_task(
     return result
 
 
+def _database_name(customer_id: str, timestamp: int) -> str:
+    """Name of the database a snapshot is loaded into: <customer_id>-<timestamp>."""
+    return f"{customer_id}-{timestamp}"
+
+
+def _list_customer_databases(session, customer_id: str) -> Tuple[List[Tuple[int, str]], Dict[str, str]]:
+    """
+    Fetch a customer's databases and all aliases on one session.
+    
+    Returns:
+        ([(timestamp, db_name), ...], {alias name: target database})
+    """
+    result = session.run(
+        "SHOW DATABASES YIELD name WHERE name STARTS WITH $prefix RETURN name",
+        prefix=f"{customer_id}-"
+    )
+    databases = []
+    for record in result:
+        db_name = record['name']
+        suffix = db_name.rpartition('-')[2]
+        if is_timestamp(suffix):
+            databases.append((int(suffix), db_name))
+    
+    aliases = {
+        record['name']: record['database']
+        for record in session.run("SHOW ALIASES FOR DATABASE YIELD name, database RETURN name, database")
+    }
+    return databases, aliases
+
+
 @task(
-    name="check-is-latest",
+    name="list-customer-databases",
     log_prints=True
 )
-def check_is_latest_task(
+def list_customer_databases_task(
     customer_id: str,
-    timestamp: int,
     config: dict
-) -> bool:
+) -> Tuple[List[Tuple[int, str]], Dict[str, str]]:
     """
-    Check if this timestamp is the latest for this customer.
+    List a customer's databases and the current aliases.
+    
+    Returns:
+        ([(timestamp, db_name), ...], {alias name: target database})
     """
     driver = get_driver(config)
-    try:
-        with driver.session(database="system") as session:
-            result = session.run(
-                f"SHOW DATABASES YIELD name WHERE name STARTS WITH '{customer_id}-' RETURN name"
-            )
-            customer_timestamps = []
-            for record in result:
-                db_name = record['name']
-                try:
-                    db_timestamp = int(db_name.split('-')[-1])
-                    customer_timestamps.append(db_timestamp)
-                except (ValueError, IndexError):
-                    continue
-            
-            is_latest = timestamp == max(customer_timestamps) if customer_timestamps else True
-            logger.info(f"Timestamp {timestamp} is {'latest' if is_latest else 'not latest'} for {customer_id}")
-            return is_latest
-    finally:
-        driver.close()
+    with driver.session(database="system") as session:
+        return _list_customer_databases(session, customer_id)
 
 
 @task(
@@ -143,53 +172,39 @@ def check_is_latest_task(
 def cleanup_old_databases_task(
     customer_id: str,
     keep_count: int,
-    config: dict
+    config: dict,
+    snapshot: Tuple[List[Tuple[int, str]], Dict[str, str]]
 ) -> int:
     """
     Remove old databases, keeping only the newest N.
     
+    Args:
+        snapshot: Result of list_customer_databases_task, reused instead of
+            querying Neo4j again
+    
     Returns:
         Number of databases cleaned up
     """
+    databases, aliases = snapshot
+    # Sort by timestamp (newest first) and keep only the tail beyond keep_count
+    candidates = sorted(databases, reverse=True)[keep_count:]
+    aliased = set(aliases.values())
+    
     driver = get_driver(config)
     cleaned_count = 0
-    try:
-        with driver.session(database="system") as session:
-            # Get all databases for this customer with their timestamps
-            result = session.run(
-                f"SHOW DATABASES YIELD name WHERE name STARTS WITH '{customer_id}-' RETURN name"
-            )
-            databases = []
-            for record in result:
-                db_name = record['name']
-                try:
-                    db_timestamp = int(db_name.split('-')[-1])
-                    databases.append((db_timestamp, db_name))
-                except (ValueError, IndexError):
-                    continue
-            
-            # Sort by timestamp (newest first)
-            databases.sort(reverse=True)
+    with driver.session(database="system") as session:
+        # Drop databases beyond keep_count, skipping any an alias still points to
+        for db_timestamp, db_name in candidates:
+            if db_name in aliased:
+                continue
             
-            # Drop databases beyond keep_count
-            for db_timestamp, db_name in databases[keep_count:]:
-                # Check if alias points to it first
-                alias_result = session.run("SHOW ALIASES FOR DATABASE")
-                has_alias = False
-                for alias_record in alias_result:
-                    if alias_record.get('database') == db_name:
-                        has_alias = True
-                        break
-                
-                if not has_alias:
-                    logger.info(f"🗑️  Dropping old database {db_name}")
-                    try:
-                        session.run(f"DROP DATABASE `{db_name}` IF EXISTS")
-                        cleaned_count += 1
-                    except Exception as e:
-                        logger.warning(f"⚠️  Could not drop {db_name}: {e}")
-    finally:
-        driver.close()
+            logger.info(f"🗑️  Dropping old database {db_name}")
+            try:
+                # Name passed as a parameter so every drop shares one query text
+                session.run("DROP DATABASE $name IF EXISTS", name=db_name)
+                cleaned_count += 1
+            except Exception as e:
+                logger.warning(f"⚠️  Could not drop {db_name}: {e}")
     
     return cleaned_count
 
@@ -210,13 +225,17 @@ def process_snapshot_flow(
     This is the main workflow that processes each snapshot.
     Visible in Prefect UI as a workflow run.
     """
-    db_name = f"{customer_id}-{timestamp}"
+    db_name = _database_name(customer_id, timestamp)
     logger.info(f"🔄 Processing snapshot: {customer_id}/{timestamp}")
     
+    # Listed once up front for the exists check and again after the load, when
+    # a concurrent load of a newer snapshot may have finished first
+    databases, aliases = list_customer_databases_task(customer_id, config)
+    
     # Step 0: Check if database already exists (prevent duplicate loads)
     # This is a critical check to prevent race conditions when multiple threads
     # try to process the same snapshot simultaneously
-    db_exists = check_database_exists_task(customer_id, timestamp, config)
+    db_exists = any(name == db_name for _, name in databases)
     if db_exists:
         logger.info(f"⏭️  Skipping {customer_id}/{timestamp} - database already exists (checked at process start)")
         # Return a dummy result indicating it was skipped
@@ -234,124 +253,176 @@ def process_snapshot_flow(
     
     # Step 2: Load database
     result = load_database_task(customer_id, timestamp, config, data_path)
+    _invalidate_database_names()
     
-    # Step 3: Check if this is the latest deployment
-    is_latest = check_is_latest_task(customer_id, timestamp, config)
+    # Step 3: Check if this is the latest deployment, against a fresh listing
+    databases, aliases = list_customer_databases_task(customer_id, config)
+    if (timestamp, db_name) not in databases:
+        databases.append((timestamp, db_name))
+    is_latest = timestamp == max(databases)[0]
+    logger.info(f"Timestamp {timestamp} is {'latest' if is_latest else 'not latest'} for {customer_id}")
     
     # Step 4: Switch alias if latest
     if is_latest:
         logger.info(f"🔄 Switching {customer_id} alias to {db_name} (latest)")
-        switch_alias_task(customer_id, db_name, config)
+        # Only a successful switch moves the alias; otherwise cleanup must keep
+        # protecting the database it still points to
+        if switch_alias_task(customer_id, db_name, config):
+            aliases[customer_id] = db_name
     
     # Step 5: Cleanup old databases (keep newest 2)
-    cleaned_count = cleanup_old_databases_task(customer_id, keep_count=2, config=config)
+    cleaned_count = cleanup_old_databases_task(customer_id, keep_count=2, config=config,
+                                               snapshot=(databases, aliases))
     if cleaned_count > 0:
+        _invalidate_database_names()
         logger.info(f"🗑️  Cleaned up {cleaned_count} old database(s)")
     
     logger.info(f"✅ Completed processing snapshot: {customer_id}/{timestamp}")
     return result
 
 
-@task(
-    name="check-database-exists",
-    log_prints=True
-)
-def check_database_exists_task(
-    customer_id: str,
-    timestamp: int,
-    config: dict
-) -> bool:
+def _list_database_names(config: dict, ttl: float = 0) -> set:
     """
-    Check if database already exists in Neo4j.
+    All database names in Neo4j, or an empty set if they can't be fetched.
     
-    Returns:
-        True if database exists, False otherwise
+    With a ttl, a successful result is reused for that many seconds. The
+    returned set may be shared, so callers must not modify it.
     """
-    db_name = f"{customer_id}-{timestamp}"
-    driver = get_driver(config)
+    with _database_names_lock:
+        cached = _database_names_cache.get("all_db_names")
+        if cached and time.monotonic() < cached[0]:
+            return cached[1]
     try:
-        with driver.session(database="system") as session:
-            result = session.run(f"SHOW DATABASES YIELD name WHERE name = '{db_name}' RETURN name")
-            exists = result.single() is not None
-            if exists:
-                logger.debug(f"Database {db_name} already exists in Neo4j")
-            return exists
+        with get_driver(config).session(database="system") as session:
+            names = {record['name'] for record in session.run("SHOW DATABASES YIELD name RETURN name")}
     except Exception as e:
-        # If we can't check (e.g., Neo4j not running), assume it doesn't exist
-        logger.debug(f"Could not check if database exists: {e}")
-        return False
-    finally:
-        driver.close()
+        # If we can't check (e.g., Neo4j not running), assume none exist
+        logger.debug(f"Could not list databases: {e}")
+        return set()
+    if ttl > 0:
+        with _database_names_lock:
+            _database_names_cache["all_db_names"] = (time.monotonic() + ttl, names)
+    return names
 
 
-@task(
-    name="scan-for-snapshots",
-    log_prints=True
-)
-def scan_for_snapshots_task(
+def _invalidate_database_names():
+    """Forget cached database names after this process creates or drops a database."""
+    with _database_names_lock:
+        _database_names_cache.pop("all_db_names", None)
+
+
+def scan_for_snapshots(
     data_base_path: Path,
     processed_snapshots: set,
-    config: dict
+    config: dict,
+    settled_dirs: Optional[Dict[str, int]] = None,
+    names_ttl: float = 0
 ) -> list:
     """
     Scan for new snapshot directories.
     
+    A plain function rather than a task: it runs every scan_interval and
+    usually finds nothing, so a task run per scan would only add Prefect API
+    traffic. Each snapshot it finds gets its own process-snapshot flow run.
+    
+    Args:
+        settled_dirs: Customer id -> directory mtime (ns) for customers that
+            had nothing pending at their last scan. Such a customer is only
+            listed again once its directory changes, i.e. a timestamp directory
+            is added or removed. A directory modified in the last
+            _SETTLE_MARGIN_NS is never marked settled. Updated in place; pass
+            the same dict each scan.
+        names_ttl: Seconds to reuse the SHOW DATABASES result across scans
+    
     Returns:
         List of (customer_id, timestamp, data_path) tuples for new snapshots
     """
     new_snapshots = []
+    if settled_dirs is None:
+        settled_dirs = {}
+    existing_databases = None  # Fetched once, on the first complete candidate
     
-    if not data_base_path.exists():
+    try:
+        customer_entries = os.scandir(data_base_path)
+    except FileNotFoundError:
         logger.warning(f"Data path does not exist: {data_base_path}")
         return new_snapshots
     
-    for customer_dir in data_base_path.iterdir():
-        if not customer_dir.is_dir():
-            continue
-        
-        customer_id = customer_dir.name
-        
-        # Look for timestamp directories
-        for timestamp_dir in customer_dir.iterdir():
-            if not timestamp_dir.is_dir():
+    # DirEntry.is_dir() comes from the directory read itself, so the walk needs
+    # no extra stat per entry (and no Path objects until a snapshot is found)
+    with customer_entries:
+        for customer_entry in customer_entries:
+            if not customer_entry.is_dir():
                 continue
             
-            try:
-                timestamp = int(timestamp_dir.name)
-            except ValueError:
-                continue
+            customer_id = customer_entry.name
             
-            # Check if we've already processed this (in-memory check)
-            snapshot_key = (customer_id, timestamp)
-            if snapshot_key in processed_snapshots:
+            # Skip customers whose directory hasn't changed since everything in it was handled
+            mtime = customer_entry.stat().st_mtime_ns
+            if settled_dirs.get(customer_id) == mtime:
                 continue
+            settled = time.time_ns() - mtime >= _SETTLE_MARGIN_NS
             
-            # Check if snapshot is complete (has nodes and relationships)
-            nodes_path = timestamp_dir / "nodes"
-            relationships_path = timestamp_dir / "relationships"
-            
-            if nodes_path.exists() and relationships_path.exists():
-                # Check if nodes and relationships directories have content
-                has_nodes = any(nodes_path.iterdir())
-                has_relationships = any(relationships_path.iterdir())
-                
-                if has_nodes and has_relationships:
-                    # Check if database already exists in Neo4j (persistent check)
-                    # This prevents reloading existing databases after restart
-                    db_exists = check_database_exists_task(customer_id, timestamp, config)
-                    if db_exists:
-                        logger.info(f"⏭️  Skipping {customer_id}/{timestamp} - database already exists")
-                        processed_snapshots.add(snapshot_key)  # Mark as processed
+            # Look for timestamp directories
+            with os.scandir(customer_entry.path) as timestamp_entries:
+                for timestamp_entry in timestamp_entries:
+                    if not is_timestamp(timestamp_entry.name) or not timestamp_entry.is_dir():
+                        continue
+                    timestamp = int(timestamp_entry.name)
+                    
+                    # Check if we've already processed this (in-memory check)
+                    snapshot_key = (customer_id, timestamp)
+                    if snapshot_key in processed_snapshots:
                         continue
                     
-                    # Don't add to processed_snapshots yet - only add when we actually start processing
-                    # This allows deferred snapshots (due to concurrency limits) to be picked up later
-                    new_snapshots.append((customer_id, timestamp, timestamp_dir))
-                    logger.info(f"📦 Discovered new snapshot: {customer_id}/{timestamp}")
+                    # Check if snapshot is complete (nodes and relationships both have content);
+                    # has_entries stops at the first dirent
+                    if (has_entries(os.path.join(timestamp_entry.path, "nodes"))
+                            and has_entries(os.path.join(timestamp_entry.path, "relationships"))):
+                        # Check if database already exists in Neo4j (persistent check)
+                        # This prevents reloading existing databases after restart
+                        if existing_databases is None:
+                            existing_databases = _list_database_names(config, names_ttl)
+                        if _database_name(customer_id, timestamp) in existing_databases:
+                            logger.info(f"⏭️  Skipping {customer_id}/{timestamp} - database already exists")
+                            processed_snapshots.add(snapshot_key)  # Mark as processed
+                            continue
+                        
+                        # Don't add to processed_snapshots yet - only add when we actually start processing
+                        # This allows deferred snapshots (due to concurrency limits) to be picked up later
+                        new_snapshots.append((customer_id, timestamp, Path(timestamp_entry.path)))
+                        logger.info(f"📦 Discovered new snapshot: {customer_id}/{timestamp}")
+                    
+                    # Discovered (maybe deferred) or still being written - look again next scan
+                    settled = False
+            
+            if settled:
+                settled_dirs[customer_id] = mtime
+            else:
+                settled_dirs.pop(customer_id, None)
     
     return new_snapshots
 
 
+def _run_snapshot_flow(
+    customer_id: str,
+    timestamp: int,
+    config: dict,
+    data_path: Path,
+    processing_lock: threading.Lock,
+    active_snapshots: set
+):
+    """Run process_snapshot_flow on a watcher pool thread, then clear it from active_snapshots."""
+    try:
+        process_snapshot_flow(customer_id, timestamp, config, data_path)
+    except Exception as e:
+        logger.error(f"Error processing snapshot {customer_id}/{timestamp}: {e}")
+    finally:
+        # Remove from active set when done
+        with processing_lock:
+            active_snapshots.discard((customer_id, timestamp))
+
+
 @flow(
     name="watch-for-snapshots",
     log_prints=True
@@ -371,12 +442,7 @@ def watch_for_snapshots_flow(
     
     config = load_config(config_path)
     
-    # Resolve data path
-    base_path_str = config['dataset']['base_path']
-    if Path(base_path_str).is_absolute():
-        data_base_path = Path(base_path_str)
-    else:
-        data_base_path = project_root / base_path_str
+    data_base_path = resolve_data_base_path(config, project_root)
     
     if not data_base_path.exists():
         raise FileNotFoundError(f"Data path does not exist: {data_base_path}")
@@ -384,17 +450,31 @@ def watch_for_snapshots_flow(
     logger.info(f"👀 Watching for snapshots in {data_base_path} (scan every {scan_interval}s)")
     
     processed_snapshots = set()
+    settled_dirs: Dict[str, int] = {}  # Customers with nothing pending, by directory mtime
     # Thread-safe tracking of snapshots currently being processed
     processing_lock = threading.Lock()
     active_snapshots = set()  # Track snapshots currently being processed
     # Limit concurrent loads to prevent overwhelming Neo4j
     # Default to 1 (sequential) for safety - can be increased if needed
     max_concurrent_loads = config.get('orchestrator', {}).get('max_concurrent_loads', 1)
-    
+    # One pool sized to the concurrency limit runs every snapshot flow so the
+    # watcher keeps scanning; active_snapshots keeps deferral out of its queue
+    executor = ThreadPoolExecutor(max_workers=max_concurrent_loads, thread_name_prefix="snapshot-load")
+    # Long enough for the next scan to reuse the database listing (e.g. while
+    # deferred snapshots wait for a free slot); loads and drops here clear it
+    names_ttl = scan_interval * 2
+    
+    consecutive_errors = 0
+    delay = 0
     while True:
         try:
+            # Wait before the scan, inside the try so Ctrl+C during a backoff
+            # still drains in-flight loads below
+            time.sleep(delay)
+            
             # Scan for new snapshots
-            new_snapshots = scan_for_snapshots_task(data_base_path, processed_snapshots, config)
+            new_snapshots = scan_for_snapshots(data_base_path, processed_snapshots, config, settled_dirs,
+                                               names_ttl=names_ttl)
             
             # Process each new snapshot as a separate workflow run
             for customer_id, timestamp, data_path in new_snapshots:
@@ -414,36 +494,25 @@ def watch_for_snapshots_flow(
                     processed_snapshots.add(snapshot_key)
                 
                 logger.info(f"🚀 Submitting snapshot for processing: {customer_id}/{timestamp}")
-                # In Prefect 3.x, call flow directly in a thread to run asynchronously
+                # In Prefect 3.x, call flow directly in a worker thread to run asynchronously
                 # Each call creates a new flow run visible in Prefect UI
-                def run_snapshot_flow(snap_key):
-                    try:
-                        process_snapshot_flow(
-                            customer_id,
-                            timestamp,
-                            config,
-                            data_path
-                        )
-                    except Exception as e:
-                        logger.error(f"Error processing snapshot {customer_id}/{timestamp}: {e}")
-                    finally:
-                        # Remove from active set when done
-                        with processing_lock:
-                            active_snapshots.discard(snap_key)
-                
-                # Run in background thread so watcher continues
-                thread = threading.Thread(target=run_snapshot_flow, args=(snapshot_key,), daemon=True)
-                thread.start()
+                executor.submit(_run_snapshot_flow, customer_id, timestamp, config, data_path,
+                                processing_lock, active_snapshots)
             
-            # Wait before next scan
-            time.sleep(scan_interval)
+            consecutive_errors = 0
+            delay = scan_interval
             
         except KeyboardInterrupt:
-            logger.info("🛑 Stopping snapshot watcher")
+            logger.info("🛑 Stopping snapshot watcher - waiting for in-flight loads to finish (Ctrl+C again to force)")
+            # Let running loads complete rather than leaving half-loaded databases behind
+            executor.shutdown(wait=True, cancel_futures=True)
+            close_drivers()
             break
         except Exception as e:
-            logger.error(f"Error in watch loop: {e}")
-            time.sleep(scan_interval)  # Continue on error
+            # Continue on error, backing off while the failure persists
+            consecutive_errors += 1
+            delay = min(scan_interval * 2 ** (consecutive_errors - 1), 300)
+            logger.error(f"Error in watch loop: {e} (retrying in {delay}s)")
 
 
 @flow(
@@ -465,12 +534,7 @@ def process_single_snapshot_flow(
     
     config = load_config(config_path)
     
-    # Resolve data path
-    base_path_str = config['dataset']['base_path']
-    if Path(base_path_str).is_absolute():
-        data_base_path = Path(base_path_str)
-    else:
-        data_base_path = project_root / base_path_str
+    data_base_path = resolve_data_base_path(config, project_root)
     
     data_path = data_base_path / customer_id / str(timestamp)
     
@@ -10,6 +10,7 @@ import shutil
 import os
 import sys
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Project root (one level up from scripts/)
@@ -28,8 +29,29 @@ CUSTOMERS = ["customer1", "customer2", "customer3"]
 TIMESTAMPS = [1767741427, 1767741527]  # Unix timestamps for demo
 
 
-def copy_data(customer_id: str, timestamp: int):
-    """Copy source data to customer/timestamp directory structure."""
+def link_or_copy(src, dst):
+    """
+    Hardlink src to dst, falling back to a full copy.
+    
+    The Parquet files are read-only fixtures, so every customer/timestamp can
+    share the source's data blocks; a copy is only needed when linking isn't
+    possible (e.g. target on a different filesystem).
+    """
+    try:
+        if os.path.lexists(dst):
+            os.unlink(dst)
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def plan_copies(customer_id: str, timestamp: int) -> list:
+    """
+    Create the customer/timestamp directory structure and list the files to copy.
+    
+    Returns:
+        List of (source_file, target_file) pairs
+    """
     if not SOURCE_NODES.exists() or not SOURCE_RELATIONSHIPS.exists():
         raise FileNotFoundError(
             f"Source data not found. Expected:\n"
@@ -39,31 +61,33 @@ def copy_data(customer_id: str, timestamp: int):
         )
     
     target_dir = TARGET_BASE / customer_id / str(timestamp)
-    target_nodes = target_dir / "nodes"
-    target_relationships = target_dir / "relationships"
-    
-    # Create directories
-    target_nodes.mkdir(parents=True, exist_ok=True)
-    target_relationships.mkdir(parents=True, exist_ok=True)
-    
-    # Copy nodes
-    print(f"Copying nodes for {customer_id}/{timestamp}...")
-    for node_type_dir in SOURCE_NODES.iterdir():
-        if node_type_dir.is_dir():
-            target_node_type = target_nodes / node_type_dir.name
-            target_node_type.mkdir(exist_ok=True)
-            for parquet_file in node_type_dir.glob("*.parquet"):
-                shutil.copy2(parquet_file, target_node_type / parquet_file.name)
-    
-    # Copy relationships
-    print(f"Copying relationships for {customer_id}/{timestamp}...")
-    for rel_type_dir in SOURCE_RELATIONSHIPS.iterdir():
-        if rel_type_dir.is_dir():
-            target_rel_type = target_relationships / rel_type_dir.name
-            target_rel_type.mkdir(exist_ok=True)
-            for parquet_file in rel_type_dir.glob("*.parquet"):
-                shutil.copy2(parquet_file, target_rel_type / parquet_file.name)
-    
+    copies = []
+    for source_dir, target_subdir in ((SOURCE_NODES, target_dir / "nodes"),
+                                      (SOURCE_RELATIONSHIPS, target_dir / "relationships")):
+        target_subdir.mkdir(parents=True, exist_ok=True)
+        for type_dir in source_dir.iterdir():
+            if type_dir.is_dir():
+                target_type_dir = target_subdir / type_dir.name
+                target_type_dir.mkdir(exist_ok=True)
+                for parquet_file in type_dir.glob("*.parquet"):
+                    copies.append((parquet_file, target_type_dir / parquet_file.name))
+    return copies
+
+
+def copy_files(copies: list):
+    """Copy (source, target) pairs concurrently; the work is I/O-bound so threads overlap it."""
+    if not copies:
+        return
+    max_workers = min(32, (os.cpu_count() or 1) * 4, len(copies))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # list() re-raises the first copy error, if any
+        list(executor.map(lambda pair: link_or_copy(*pair), copies))
+
+
+def copy_data(customer_id: str, timestamp: int):
+    """Copy source data to customer/timestamp directory structure."""
+    print(f"Copying data for {customer_id}/{timestamp}...")
+    copy_files(plan_copies(customer_id, timestamp))
     print(f"✅ Completed {customer_id}/{timestamp}")
 
 
@@ -74,9 +98,13 @@ def main():
     print(f"Target: {TARGET_BASE}")
     print(f"Creating {len(CUSTOMERS)} customers × {len(TIMESTAMPS)} timestamps = {len(CUSTOMERS) * len(TIMESTAMPS)} datasets\n")
     
+    # Create every directory first, then copy all files across datasets in one pool
+    copies = []
     for customer_id in CUSTOMERS:
         for timestamp in TIMESTAMPS:
-            copy_data(customer_id, timestamp)
+            copies.extend(plan_copies(customer_id, timestamp))
+    print(f"Copying {len(copies)} files...")
+    copy_files(copies)
     
     print(f"\n✅ Demo data setup complete!")
     print(f"Created {len(CUSTOMERS) * len(TIMESTAMPS)} datasets in {TARGET_BASE}")
@@ -3,14 +3,19 @@
 Simulate dropping a new snapshot by copying existing data to a new timestamp.
 Useful for testing the orchestrator.
 """
+import os
 import sys
 import shutil
 import time
 from pathlib import Path
-from blue_green_etl.config_loader import load_config
+from blue_green_etl.config_loader import load_config, resolve_data_base_path
 
 # Project root (one level up from scripts/)
 project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.setup_demo_data import link_or_copy
+
 
 def simulate_snapshot(customer_id: str, source_timestamp: int, data_base_path: Path):
     """Create a new snapshot by copying an existing one with a new timestamp."""
@@ -27,8 +32,8 @@ def simulate_snapshot(customer_id: str, source_timestamp: int, data_base_path: P
     print(f"   Source: {source_path}")
     print(f"   Target: {target_path}")
     
-    # Copy the snapshot
-    shutil.copytree(source_path, target_path)
+    # Copy the snapshot (directory tree only; files are hardlinked where possible)
+    shutil.copytree(source_path, target_path, copy_function=link_or_copy)
     
     print(f"✅ Created snapshot: {customer_id}/{new_timestamp}")
     print(f"   The orchestrator should detect this within 30 seconds")
@@ -49,16 +54,10 @@ def main():
     
     # Get data path from config if not specified
     if args.config:
-        import yaml
         config_path = project_root / args.config
         if config_path.exists():
             config = load_config(config_path)
-                # Resolve base_path - if relative, make it relative to project root
-            base_path_str = config['dataset']['base_path']
-            if Path(base_path_str).is_absolute():
-                data_base_path = Path(base_path_str)
-            else:
-                data_base_path = project_root / base_path_str
+            data_base_path = resolve_data_base_path(config, project_root)
         else:
             data_base_path = project_root / args.data_path
     else:
@@ -68,15 +67,13 @@ def main():
     if not args.source_timestamp:
         customer_dir = data_base_path / args.customer
         if customer_dir.exists():
-            timestamps = []
-            for ts_dir in customer_dir.iterdir():
-                if ts_dir.is_dir():
-                    try:
-                        timestamps.append(int(ts_dir.name))
-                    except ValueError:
-                        continue
-            if timestamps:
-                args.source_timestamp = max(timestamps)
+            with os.scandir(customer_dir) as entries:
+                args.source_timestamp = max(
+                    (int(entry.name) for entry in entries
+                     if entry.name.isascii() and entry.name.isdigit() and entry.is_dir()),
+                    default=None
+                )
+            if args.source_timestamp is not None:
                 print(f"📋 Using latest existing timestamp: {args.source_timestamp}")
             else:
                 print(f"❌ No existing snapshots found for {args.customer}")
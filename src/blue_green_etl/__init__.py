@@ -6,14 +6,16 @@ __version__ = "0.1.0"
 
 from .neo4j_arrow_client import Neo4jArrowClient
 from .neo4j_utils import get_driver
-from .logging_config import setup_logging, get_logger
-from .config_loader import load_config
+from .logging_config import setup_logging, get_logger, shutdown_logging
+from .config_loader import load_config, resolve_data_base_path
 
 __all__ = [
     "Neo4jArrowClient",
     "get_driver",
     "setup_logging",
     "get_logger",
+    "shutdown_logging",
     "load_config",
+    "resolve_data_base_path",
 ]
 
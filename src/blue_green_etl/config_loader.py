@@ -5,11 +5,20 @@ This module provides a function to load YAML configuration files with support
 for environment variable substitution. Secrets can be injected at runtime
 via environment variables.
 """
+import copy
 import os
+import re
 import yaml
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any
 
+# Prefer libyaml's C loader when PyYAML was built with it
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Pattern: ${VAR_NAME} or ${VAR_NAME:default}
+_ENV_VAR_RE = re.compile(r'\$\{([^}]+)\}')
+
 
 def load_config(config_path: Path) -> Dict[str, Any]:
     """
@@ -21,6 +30,11 @@ def load_config(config_path: Path) -> Dict[str, Any]:
     
     For Neo4j password, use: NEO4J_PASSWORD environment variable.
     
+    The file is re-read only when its modification time or size changes, and
+    parsed once per distinct substituted content, so a changed environment
+    variable takes effect on the next call. Each call returns its own copy,
+    so callers may modify the result.
+    
     Args:
         config_path: Path to YAML configuration file
         
@@ -31,17 +45,19 @@ def load_config(config_path: Path) -> Dict[str, Any]:
         FileNotFoundError: If config file doesn't exist
         ValueError: If required environment variable is missing
     """
-    if not config_path.exists():
-        raise FileNotFoundError(f"Configuration file not found: {config_path}")
+    config_path = Path(config_path)
+    # One stat both checks the file exists and provides the cache key
+    try:
+        stat = os.stat(config_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Configuration file not found: {config_path}") from None
     
-    with open(config_path) as f:
-        content = f.read()
+    content = _read_config_cached(os.path.abspath(config_path), stat.st_mtime_ns, stat.st_size)
     
-    # Substitute environment variables
+    # Substitute environment variables (per call: the environment may have changed)
     content = _substitute_env_vars(content)
     
-    # Parse YAML
-    config = yaml.safe_load(content)
+    config = copy.deepcopy(_parse_config_cached(content))
     
     # Special handling: If password is still a placeholder or empty, try NEO4J_PASSWORD
     if 'neo4j' in config and 'password' in config['neo4j']:
@@ -59,6 +75,37 @@ def load_config(config_path: Path) -> Dict[str, Any]:
     return config
 
 
+@lru_cache(maxsize=8)
+def _read_config_cached(config_path: str, mtime_ns: int, size: int) -> str:
+    """Read a config file; mtime_ns and size are only part of the cache key."""
+    with open(config_path) as f:
+        return f.read()
+
+
+@lru_cache(maxsize=8)
+def _parse_config_cached(content: str) -> Dict[str, Any]:
+    """Parse substituted config text; callers must copy the result before modifying it."""
+    return yaml.load(content, Loader=_SafeLoader)
+
+
+def resolve_data_base_path(config: Dict[str, Any], base_dir: Path) -> Path:
+    """
+    Resolve dataset.base_path from a loaded configuration.
+    
+    Args:
+        config: Configuration dictionary with a 'dataset' section
+        base_dir: Directory a relative base_path is relative to (normally the
+            project root, where config.yaml lives)
+        
+    Returns:
+        base_path as-is if absolute, otherwise joined onto base_dir
+    """
+    base_path = Path(config['dataset']['base_path'])
+    if base_path.is_absolute():
+        return base_path
+    return Path(base_dir) / base_path
+
+
 def _substitute_env_vars(content: str) -> str:
     """
     Substitute environment variables in string content.
@@ -73,7 +120,9 @@ def _substitute_env_vars(content: str) -> str:
     Returns:
         String with environment variables substituted
     """
-    import re
+    # Most files have no placeholders; skip the regex scan entirely
+    if '${' not in content:
+        return content
     
     def replace_var(match):
         var_expr = match.group(1)
@@ -92,7 +141,5 @@ def _substitute_env_vars(content: str) -> str:
                 )
             return value
     
-    # Pattern: ${VAR_NAME} or ${VAR_NAME:default}
-    pattern = r'\$\{([^}]+)\}'
-    return re.sub(pattern, replace_var, content)
+    return _ENV_VAR_RE.sub(replace_var, content)
 
@@ -1,32 +1,56 @@
 from typing import Any, Dict, Iterable, Union, Tuple, Optional
 from enum import Enum
 import json
-import os
-import sys
 import time
+import random
 import base64
-import secrets
 import logging
 
 import pyarrow as pa
 import pyarrow.flight as flight
 from pyarrow.flight import ClientMiddleware, ClientMiddlewareFactory
 
-# Import neo4j_arrow_error - handle both relative (when in package) and absolute (when imported directly)
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Optional: faster action/descriptor encoding
+
+# Import neo4j_arrow_error - relative when imported as part of the package, absolute when
+# loaded as a top-level module (src/ must then be on sys.path / PYTHONPATH)
 try:
     from . import neo4j_arrow_error as error
 except ImportError:
-    # Fallback for when imported directly or in subprocess
-    import sys
-    from pathlib import Path
-    # Try to find the package
-    current_file = Path(__file__).resolve()
-    src_path = current_file.parent.parent.parent / "src"
-    if str(src_path) not in sys.path:
-        sys.path.insert(0, str(src_path))
     from blue_green_etl import neo4j_arrow_error as error
 
 
+# Small record batches are coalesced up to this size before they are sent, so
+# each Flight message carries a useful amount of data
+WRITE_TARGET_BYTES = 64 << 20
+
+
+# Errors that another attempt won't fix; retry_on_failure raises these at once
+PERMANENT_ERRORS = (
+    error.InvalidArgument,
+    error.NotFound,
+    flight.FlightUnauthenticatedError,
+    flight.FlightUnauthorizedError,
+)
+
+
+def _encode_json(body: Dict[str, Any]) -> bytes:
+    """Compact UTF-8 JSON for Flight action bodies and descriptors."""
+    if orjson is not None:
+        return orjson.dumps(body)
+    return json.dumps(body, separators=(",", ":")).encode("utf-8")
+
+
+def _decode_json(data: bytes) -> Any:
+    """Parse a UTF-8 JSON action result straight from bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 class ClientState(Enum):
     READY = "ready"
     FEEDING_NODES = "feeding_nodes"
@@ -51,6 +75,9 @@ class Neo4jArrowClient():
         self.concurrency = concurrency
         self.state = ClientState.READY
         self.logger = logging.getLogger("Neo4jArrowClient")
+        # Upload descriptors by (graph name, entity type); every fragment
+        # written for the same graph and entity type reuses one
+        self._descriptors: Dict[Tuple[str, str], flight.FlightDescriptor] = {}
 
     def __str__(self):
         return f"Neo4jArrowClient{{{self.user}@{self.host}:{self.port}/{self.database}}}"
@@ -62,8 +89,21 @@ class Neo4jArrowClient():
             del state["client"]
         if "call_opts" in state:
             del state["call_opts"]
+        state.pop("_descriptors", None)
         return state
 
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.client = None
+        self.call_opts = None
+        self._descriptors = {}
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
     def copy(self):
         client = Neo4jArrowClient(self.host, port=self.port, user=self.user,
                                   password=self.password,
@@ -73,6 +113,14 @@ class Neo4jArrowClient():
         return client
 
     def _client(self):
+        """
+        Return the FlightClient, connecting on first use.
+        
+        The connection is reused by every action and upload until close() is
+        called (or a transport error drops it).
+        """
+        if self.client is not None:
+            return self.client
 
         '''location = (
             flight.Location.for_grpc_tls(self.host, self.port)
@@ -92,6 +140,12 @@ class Neo4jArrowClient():
 
         return self.client
 
+    def close(self):
+        """Close the FlightClient connection, if any; the next call reconnects."""
+        client, self.client = self.client, None
+        if client is not None:
+            client.close()
+
     def abort(self, name: Optional[str] = None) -> bool:
         """Try aborting an existing import process.
         
@@ -131,13 +185,16 @@ class Neo4jArrowClient():
         """
         client = self._client()
         try:
-            payload = json.dumps(body).encode("utf-8")
+            payload = _encode_json(body)
             result = client.do_action(
                 flight.Action(action, payload),
                 options=self.call_opts
             )
-            return json.loads(next(result).body.to_pybytes().decode())
+            return _decode_json(next(result).body.to_pybytes())
         except Exception as e:
+            if isinstance(e, flight.FlightUnavailableError):
+                # Connection is gone; reconnect on the next call
+                self.close()
             # Interpret the exception to check if it's a NotFound error
             interpreted = error.interpret(e)
             
@@ -149,73 +206,114 @@ class Neo4jArrowClient():
             raise interpreted
 
 
-    def _write_table(self, desc: bytes, table: pa.Table, mappingfn = None) -> Tuple[int, int]:
+    def _write_table(self, upload_descriptor: flight.FlightDescriptor, table: pa.Table,
+                     mappingfn = None) -> Tuple[int, int]:
         """
         Write a PyArrow Table to the GDS Flight service.
         """
         client = self._client()
         fn = mappingfn or self._nop
-        upload_descriptor = flight.FlightDescriptor.for_command(
-            json.dumps(desc).encode("utf-8")
-        )
         
         writer, _ = client.do_put(upload_descriptor, table.schema, options=self.call_opts)
         with writer:
             try:
                 writer.write_table(table)
-                client.close()
                 return table.num_rows, table.get_total_buffer_size()
             except Exception as e:
                 self.logger.error(f"_write_table error: {e}")
-        client.close()
         return 0, 0
 
+    def _upload_descriptor(self, entity_type: str) -> flight.FlightDescriptor:
+        """Upload FlightDescriptor for entity_type rows of the target graph, encoded once and then reused."""
+        name = self.database if self.projection is None else self.projection
+        key = (name, entity_type)
+        descriptor = self._descriptors.get(key)
+        if descriptor is None:
+            descriptor = flight.FlightDescriptor.for_command(
+                _encode_json({"name": name, "entity_type": entity_type})
+            )
+            self._descriptors[key] = descriptor
+        return descriptor
+
     @classmethod
     def _nop(*args, **kwargs):
         pass
 
-    def _write_batches(self, desc: bytes, batches, mappingfn = None) -> Tuple[int, int]:
+    @staticmethod
+    def _identity(batch):
+        return batch
+
+    def _write_batches(self, upload_descriptor: flight.FlightDescriptor, batches, mappingfn = None,
+                       target_bytes: int = WRITE_TARGET_BYTES) -> Tuple[int, int]:
         """
         Write PyArrow RecordBatches to the GDS Flight service.
+        
+        Mapped batches are buffered until they reach target_bytes and then sent
+        as one combined batch, rather than one Flight message per input batch.
         """
         batches = iter(batches)
-        fn = mappingfn or self._nop
+        # Without a mapping function batches are sent unchanged
+        fn = mappingfn or self._identity
 
-        first = fn(next(batches, None))
-        if not first:
+        # Check for an empty iterable before mapping: a mapped batch with zero
+        # rows is falsy but still a valid batch to send
+        raw_first = next(batches, None)
+        if raw_first is None:
             raise Exception("empty iterable of record batches provided")
+        first = fn(raw_first)
         
         client = self._client()
-        upload_descriptor = flight.FlightDescriptor.for_command(
-            json.dumps(desc).encode("utf-8")
-        )
         rows, nbytes = 0, 0
         writer, reader = client.do_put(upload_descriptor, first.schema, options=self.call_opts)
         with writer:
             try:
-                writer.write_batch(first)
-                rows += first.num_rows
-                nbytes += first.get_total_buffer_size()
+                # Only batches that have been sent are counted, so a failed write
+                # doesn't report buffered data as uploaded
+                pending, pending_bytes = [first], first.get_total_buffer_size()
                 for remaining in batches:
-                    writer.write_batch(fn(remaining))
-                    rows += remaining.num_rows
-                    nbytes += remaining.get_total_buffer_size()
+                    if pending_bytes >= target_bytes:
+                        rows += self._flush_batches(writer, pending)
+                        nbytes += pending_bytes
+                        pending, pending_bytes = [], 0
+                    batch = fn(remaining)
+                    pending.append(batch)
+                    pending_bytes += batch.get_total_buffer_size()
+                rows += self._flush_batches(writer, pending)
+                nbytes += pending_bytes
             except Exception as e:
                 self.logger.error(f"_write_batches error: {e}")
-        client.close()
         return rows, nbytes
 
-    def retry_on_failure(max_retries, delay=1):
+    @staticmethod
+    def _flush_batches(writer, batches) -> int:
+        """Send buffered batches as a single record batch and return the rows sent."""
+        if len(batches) == 1:
+            writer.write_batch(batches[0])
+        else:
+            writer.write_table(pa.Table.from_batches(batches).combine_chunks())
+        return sum(batch.num_rows for batch in batches)
+
+    def retry_on_failure(max_retries, delay=1, max_delay=60):
+        """
+        Retry a method with exponential backoff and jitter.
+        
+        Waits delay * 2**attempt seconds (capped at max_delay), scaled by a
+        random factor in [0.5, 1.5) so workers retrying together spread out.
+        Errors in PERMANENT_ERRORS are raised without retrying.
+        """
         def decorator(func):
             def wrapper(self, *args, **kwargs):
                 for attempt in range(max_retries):
                     try:
                         result = func(self, *args, **kwargs)
                         return result
+                    except PERMANENT_ERRORS:
+                        raise
                     except Exception as e:
                         if attempt < max_retries - 1:
-                            self.logger.warning(f"Error occurred: {e}. Retrying... (attempt {attempt + 1}/{max_retries})")
-                            time.sleep(delay)
+                            sleep_for = min(delay * 2 ** attempt, max_delay) * (0.5 + random.random())
+                            self.logger.warning(f"Error occurred: {e}. Retrying in {sleep_for:.1f}s... (attempt {attempt + 1}/{max_retries})")
+                            time.sleep(sleep_for)
                         else:
                             self.logger.error(f"Maximum retries ({max_retries}) exceeded. Function failed.")
                             raise
@@ -256,11 +354,11 @@ class Neo4jArrowClient():
 
     def write_nodes(self, nodes: Union[pa.Table, Iterable[pa.RecordBatch]], mappingfn = None) -> Tuple[int, int]:
         assert self.state == ClientState.FEEDING_NODES
-        desc = { "name": self.database if self.projection == None else self.projection, "entity_type": "node" }
+        upload_descriptor = self._upload_descriptor("node")
         
         if isinstance(nodes, pa.Table):
-            return self._write_table(desc, nodes, mappingfn)
-        return self._write_batches(desc, nodes, mappingfn)
+            return self._write_table(upload_descriptor, nodes, mappingfn)
+        return self._write_batches(upload_descriptor, nodes, mappingfn)
 
     def nodes_done(self) -> Dict[str, Any]:
         assert self.state == ClientState.FEEDING_NODES
@@ -272,12 +370,12 @@ class Neo4jArrowClient():
     def write_edges(self, edges: Union[pa.Table, Iterable[pa.RecordBatch]], mappingfn = None) -> Tuple[int, int]:
         assert self.state == ClientState.FEEDING_EDGES
         
-        desc = { "name": self.database if self.projection == None else self.projection, "entity_type": "relationship" }
+        upload_descriptor = self._upload_descriptor("relationship")
 
         if isinstance(edges, pa.Table):
-            return self._write_table(desc, edges, mappingfn)
+            return self._write_table(upload_descriptor, edges, mappingfn)
         
-        return self._write_batches(desc, edges, mappingfn)
+        return self._write_batches(upload_descriptor, edges, mappingfn)
 
     def edges_done(self) -> Dict[str, Any]:
         assert self.state == ClientState.FEEDING_EDGES
@@ -285,8 +383,6 @@ class Neo4jArrowClient():
                                    { "name": self.database if self.projection == None else self.projection })
         if result:
             self.state = ClientState.AWAITING_GRAPH
-        client = self._client()
-        client.close()
         return result
 
     def wait(timeout: int = 0):
@@ -301,18 +397,20 @@ class AuthFactory(ClientMiddlewareFactory):  # type: ignore
         self._auth = auth
         self._token: Optional[str] = None
         self._token_timestamp = 0
+        # The Basic header never changes, so encode it once
+        username, password = auth
+        self._basic_header = "Basic " + base64.b64encode(f"{username}:{password}".encode("utf-8")).decode("ASCII")
 
     def start_call(self, info: Any) -> "AuthMiddleware":
         return AuthMiddleware(self)
 
     def token(self) -> Optional[str]:
-        # check whether the token is older than 10 minutes. If so, reset it.
-        
-        #if self._token and int(time.time()) - self._token_timestamp > 600:
-        #Always set token to none to reset token
+        # Reuse the bearer token for 10 minutes, then fall back to Basic auth
+        # so the server issues a fresh one
+        if self._token and int(time.time()) - self._token_timestamp < 600:
+            return self._token
         self._token = None
-      
-        return self._token
+        return None
 
     def set_token(self, token: str) -> None:
         self._token = token
@@ -322,6 +420,10 @@ class AuthFactory(ClientMiddlewareFactory):  # type: ignore
     def auth(self) -> Tuple[str, str]:
         return self._auth
 
+    @property
+    def basic_header(self) -> str:
+        return self._basic_header
+
 
 class AuthMiddleware(ClientMiddleware):  # type: ignore
     
@@ -340,11 +442,8 @@ class AuthMiddleware(ClientMiddleware):  # type: ignore
     def sending_headers(self) -> Dict[str, str]:
         token = self._factory.token()
         if not token:
-            username, password = self._factory.auth
-            auth_token = f"{username}:{password}"
-            auth_token = "Basic " + base64.b64encode(auth_token.encode("utf-8")).decode("ASCII")
             # There seems to be a bug, `authorization` must be lower key
-            return {"authorization": auth_token}
+            return {"authorization": self._factory.basic_header}
         else:
             return {"authorization": "Bearer " + token}
 
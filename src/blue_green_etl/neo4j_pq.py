@@ -1,4 +1,4 @@
-from typing import Any, Callable, Dict, List, Union, Tuple
+from typing import Any, Callable, Dict, List, Optional, Union, Tuple
 from pathlib import Path
 
 import pickle
@@ -7,23 +7,18 @@ import sys
 import time
 import multiprocessing as mp
 import subprocess as sub
+import threading
 import logging
 
 import pyarrow as pa
+import pyarrow.compute as pc
 from pyarrow import parquet as pq
 
-# Import neo4j_arrow_client - handle both relative (when in package) and absolute (when imported directly)
+# Import neo4j_arrow_client - relative when imported as part of the package, absolute when
+# this file runs as a script (fan_out's subprocess puts src/ on PYTHONPATH)
 try:
     from . import neo4j_arrow_client as na
 except ImportError:
-    # Fallback for when imported directly or in subprocess
-    import sys
-    from pathlib import Path
-    # Try to find the package
-    current_file = Path(__file__).resolve()
-    src_path = current_file.parent.parent.parent / "src"
-    if str(src_path) not in sys.path:
-        sys.path.insert(0, str(src_path))
     from blue_green_etl import neo4j_arrow_client as na
 
 # Set up logger for this module
@@ -31,6 +26,11 @@ logger = logging.getLogger("neo4j_pq")
 
 _worker_na_client = None
 
+# Protocol for the fan_out stdin/stdout payloads. Both directions carry only
+# small objects (the client's connection settings, paths, per-worker counts),
+# so everything is pickled in-band.
+_PICKLE_PROTOCOL = 5
+
 
 def _initializer(client: na.Neo4jArrowClient):
     """Initializer for our multiprocessing Pool members."""
@@ -40,45 +40,57 @@ def _initializer(client: na.Neo4jArrowClient):
     _worker_na_client = client
 
 
+# Target names for the leading columns, and the type the labels column is loaded as
+_NODE_COLUMN_NAMES = ("nodeId", "labels")
+_EDGE_COLUMN_NAMES = ("sourceNodeId", "targetNodeId", "relationshipType")
+_LABEL_COLUMNS = ('labels', 'LABELS')
+_LABELS_FIELD = pa.field('labels', pa.list_(pa.string()))
+
+
+def _rename_leading(schema: pa.Schema, names) -> pa.Schema:
+    """schema with its first len(names) fields renamed; types, nullability and metadata are kept."""
+    fields = [field.with_name(name) for field, name in zip(schema, names)]
+    return pa.schema(fields + list(schema)[len(fields):], metadata=schema.metadata)
+
+
+def _node_schema(schema: pa.Schema) -> pa.Schema:
+    """Schema a node batch is loaded with: id and labels renamed, labels as list<string>."""
+    # assumption: id and labels are the first two columns
+    new_schema = _rename_leading(schema, _NODE_COLUMN_NAMES)
+    if len(schema) > 1:
+        new_schema = new_schema.set(1, _LABELS_FIELD)
+    return new_schema
+
+
 def _process_nodes(nodes, **kwargs) -> Tuple[int, int]:
     """Streams the given PyArrow table to the Neo4j server using a Neo4jArrowClient."""
     global _worker_na_client
     assert _worker_na_client
 
-    def split_labels(value):
-        if(',' in value):
-            return value.split(",")
-        return [value]
-
-    def update_batch(batch, new_schema):
-        columns = []
-        my_columns = ['labels','LABELS']
-        for column_name in batch.column_names:
-            column_data = batch[column_name]
-            if column_name in my_columns:
-                column_data = pa.array(batch[column_name].to_pandas().apply(split_labels))
-            columns.append(column_data)
-        
-        updated_batch = pa.RecordBatch.from_arrays(
-            columns,
-            schema=new_schema
-        )
-
-        return updated_batch
+    # Batches from one fragment share a schema, so the target schema and the
+    # label column positions are worked out once and reused until it changes
+    source_schema = new_schema = label_idx = None
 
     # Perform last mile renaming of any fields in our PyArrow Table
     def map_batch(batch):
-        new_schema = batch.schema
-        for idx, name in enumerate(batch.schema.names):  # assumption: they're in the column order
-            field = new_schema.field(name)
-            if idx == 0:
-                new_schema = new_schema.set(idx, field.with_name("nodeId"))
-            elif idx == 1:
-                new_schema = new_schema.set(idx, field.with_name("labels"))
-                new_schema = new_schema.set(idx, pa.field('labels', pa.list_(pa.string())))
-
-        # Convert comma separated label string to an arrow array 
-        return update_batch(batch, new_schema)
+        nonlocal source_schema, new_schema, label_idx
+        if source_schema is None or not batch.schema.equals(source_schema):
+            source_schema = batch.schema
+            new_schema = _node_schema(source_schema)
+            # Only string labels need splitting; list<string> labels are already in
+            # shape. large_string is narrowed first so the split yields list<string>.
+            label_idx = [
+                (idx, pa.types.is_large_string(field.type)) for idx, field in enumerate(source_schema)
+                if field.name in _LABEL_COLUMNS
+                and (pa.types.is_string(field.type) or pa.types.is_large_string(field.type))
+            ]
+        # Convert comma separated label strings to lists: "A,B" -> ["A", "B"]
+        # and "A" -> ["A"], in one Arrow kernel call
+        columns = batch.columns
+        for idx, large in label_idx:
+            column = columns[idx].cast(pa.string()) if large else columns[idx]
+            columns[idx] = pc.split_pattern(column, pattern=",")
+        return pa.RecordBatch.from_arrays(columns, schema=new_schema)
 
     # feed the graph
     return _worker_na_client.write_nodes(nodes, map_batch)
@@ -89,18 +101,17 @@ def _process_edges(edges, **kwargs) -> Tuple[int, int]:
     global _worker_na_client
     assert _worker_na_client
 
-    # Perform last mile renaming of any fields in our PyArrow Table/Recordbatch
+    source_schema = new_schema = None
+
+    # Perform last mile renaming of any fields in our PyArrow Table/Recordbatch;
+    # the column buffers are reused as-is, only the schema changes
     def map_batch(batch):
-        new_schema = batch.schema
-        for idx, name in enumerate(batch.schema.names):  # assumption: they're in the column order
-            field = new_schema.field(name)
-            if idx == 0:
-                new_schema = new_schema.set(idx, field.with_name("sourceNodeId"))
-            elif idx == 1:
-                new_schema = new_schema.set(idx, field.with_name("targetNodeId"))
-            elif idx == 2:
-                new_schema = new_schema.set(idx, field.with_name("relationshipType"))
-        return batch.from_arrays(batch.columns, schema=new_schema)
+        nonlocal source_schema, new_schema
+        if source_schema is None or not batch.schema.equals(source_schema):
+            source_schema = batch.schema
+            # assumption: source, target and type are the first three columns
+            new_schema = _rename_leading(source_schema, _EDGE_COLUMN_NAMES)
+        return pa.RecordBatch.from_arrays(batch.columns, schema=new_schema)
 
     # feed the graph
     return _worker_na_client.write_edges(edges, map_batch)
@@ -113,18 +124,6 @@ def worker(work: Union[Dict[str, Any], List[Dict[str, Any]]]) -> Dict[str, Any]:
     if isinstance(work, dict):
         work = [work]
 
-    def consume_fragment(consumer, **kwargs):
-        """Apply consumer to a PyArrow Fragment in the form of a generator"""
-
-        fragment = kwargs["fragment"]
-        scanner = fragment.scanner(batch_size=kwargs["table_size"])
-
-        def batch_generator():
-            for recordBatch in scanner.to_batches():
-                yield recordBatch
-
-        yield consumer(batch_generator(), **kwargs)
-
     total_rows, total_bytes = 0, 0
 
     # For now, we identify the work type based on its schema
@@ -135,9 +134,13 @@ def worker(work: Union[Dict[str, Any], List[Dict[str, Any]]]) -> Dict[str, Any]:
             fn = _process_edges
         else:
             raise Exception(f"{name} can't pick a consuming function")
-        for rows, nbytes in consume_fragment(fn, **task):
-            total_rows += rows
-            total_bytes += nbytes
+        # to_batches() is already an iterator; hand it straight to the consumer
+        # columns=None reads every column; a list projects the scan so Parquet
+        # skips the other column chunks entirely
+        scanner = task["fragment"].scanner(batch_size=task["table_size"], columns=task.get("columns"))
+        rows, nbytes = fn(scanner.to_batches(), **task)
+        total_rows += rows
+        total_bytes += nbytes
     return {"name": name, "rows": total_rows, "bytes": total_bytes}
 
 
@@ -163,7 +166,8 @@ def worker(work: Union[Dict[str, Any], List[Dict[str, Any]]]) -> Dict[str, Any]:
 ###############################################################################
 
 def fan_out(client: na.Neo4jArrowClient, data: str, arrow_table_size: int,
-            processes: int = 0, timeout: int = 1000000) -> Tuple[List[Any], float]:
+            processes: int = 0, timeout: int = 1000000,
+            columns: Optional[List[str]] = None) -> Tuple[List[Any], float]:
     """
     This is where the magic happens. Pop open a subprocess that execs this same
     module. Once the child is alive, send it some pickled objects to bootstrap
@@ -171,18 +175,27 @@ def fan_out(client: na.Neo4jArrowClient, data: str, arrow_table_size: int,
     data via stdout and messaging via stderr.
 
     This design solves problems with Jupyter kernels mismanaging children.
+
+    columns limits which Parquet columns are read (None, the default, reads
+    them all). Every column read is loaded, so a projection must keep the id
+    and labels (or source, target and type) columns first, followed by the
+    properties to load.
     """
-    config = {"processes": processes, "client": client.copy(), "arrow_table_size": arrow_table_size}
-    payload = pickle.dumps((config, data))
+    config = {"processes": processes, "client": client.copy(), "arrow_table_size": arrow_table_size,
+              "columns": columns}
+    payload = pickle.dumps((config, data), protocol=_PICKLE_PROTOCOL)
 
     # Use absolute path to neo4j_pq.py based on this file's location
     neo4j_pq_path = Path(__file__).resolve()
     argv = [sys.executable, str(neo4j_pq_path)]
+    # The child runs this file as a script, so it imports the package absolutely;
+    # put src/ on its PYTHONPATH instead of having it patch sys.path itself
+    src_path = str(neo4j_pq_path.parent.parent)
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [src_path, env.get("PYTHONPATH")]))
     
     # Capture stderr to log subprocess output in real-time (stdout must stay binary for pickle)
-    import threading
-    
-    with sub.Popen(argv, stdin=sub.PIPE, stdout=sub.PIPE, stderr=sub.PIPE, bufsize=0) as proc:
+    with sub.Popen(argv, stdin=sub.PIPE, stdout=sub.PIPE, stderr=sub.PIPE, bufsize=0, env=env) as proc:
         try:
             # Send payload
             proc.stdin.write(payload)
@@ -192,30 +205,31 @@ def fan_out(client: na.Neo4jArrowClient, data: str, arrow_table_size: int,
             stderr_done = threading.Event()
             
             def read_stderr():
-                """Read stderr line by line and log immediately."""
+                """Read stderr in chunks and log each complete line."""
                 lines_read = 0
+                buf = b""
                 try:
-                    # Read stderr line by line - this blocks until data is available
-                    for line_bytes in iter(proc.stderr.readline, b''):
-                        if not line_bytes:
+                    # os.read returns whatever is available (up to 64 KiB) instead of
+                    # one readline per line; lines are split out of the chunk here
+                    fd = proc.stderr.fileno()
+                    log_line = logger.info
+                    while True:
+                        chunk = os.read(fd, 65536)
+                        if not chunk:
                             break
-                        line = line_bytes.decode('utf-8', errors='replace').rstrip()
-                        if line:  # Only log non-empty lines
-                            lines_read += 1
-                            # Use the neo4j_pq logger (which inherits from root)
-                            # This ensures proper formatting and goes to all handlers
-                            logger.info(line)
-                            # Force immediate flush of all handlers
-                            root_logger = logging.getLogger()
-                            for handler in root_logger.handlers:
-                                handler.flush()
-                                # For file handlers, also sync to disk
-                                if hasattr(handler, 'stream') and handler.stream and hasattr(handler.stream, 'fileno'):
-                                    try:
-                                        import os
-                                        os.fsync(handler.stream.fileno())
-                                    except (OSError, AttributeError):
-                                        pass
+                        *lines, buf = (buf + chunk).split(b"\n")
+                        for line_bytes in lines:
+                            line = line_bytes.decode('utf-8', errors='replace').rstrip()
+                            if line:  # Only log non-empty lines
+                                lines_read += 1
+                                # Use the neo4j_pq logger (which inherits from root)
+                                # This ensures proper formatting and goes to all handlers
+                                log_line(line)
+                    # Whatever followed the last newline (e.g. the end of the progress bar)
+                    line = buf.decode('utf-8', errors='replace').rstrip()
+                    if line:
+                        lines_read += 1
+                        logger.info(line)
                     # Log if we read any lines (for debugging)
                     if lines_read == 0:
                         logger.warning("read_stderr: No lines read from subprocess stderr")
@@ -223,8 +237,7 @@ def fan_out(client: na.Neo4jArrowClient, data: str, arrow_table_size: int,
                         logger.debug(f"read_stderr: Read {lines_read} lines from subprocess stderr")
                 except Exception as e:
                     # Log the full exception for debugging
-                    import traceback
-                    logger.error(f"Error reading stderr: {e}\n{traceback.format_exc()}")
+                    logger.error(f"Error reading stderr: {e}", exc_info=True)
                 finally:
                     stderr_done.set()
             
@@ -271,18 +284,19 @@ if __name__ == "__main__":
 
         work = []
         arrow_table_size = config['arrow_table_size']
+        columns = config.get('columns')
         # Create pyarrow parquet dataset from passed uri location
         pyarrow_dataset = pq.ParquetDataset(data)
         log(f"Dataset {type(pyarrow_dataset)} created from: {data}")
 
         # Break the pyarrow parquet dataset into fragments
         if "nodes" in data:
-            work = [dict(key="node", fragment=fragment, table_size=arrow_table_size) for fragment in
-                    pyarrow_dataset.fragments]
+            work = [dict(key="node", fragment=fragment, table_size=arrow_table_size, columns=columns)
+                    for fragment in pyarrow_dataset.fragments]
 
         elif "relationships" in data:
-            work = [dict(src="edge", fragment=fragment, table_size=arrow_table_size) for fragment in
-                    pyarrow_dataset.fragments]
+            work = [dict(src="edge", fragment=fragment, table_size=arrow_table_size, columns=columns)
+                    for fragment in pyarrow_dataset.fragments]
 
         client = config["client"]
         log(f"Using: 🚀 {client}")
@@ -290,26 +304,30 @@ if __name__ == "__main__":
         processes = min(len(work), config.get("processes") or int(mp.cpu_count() * 1.3))
         log(f"Spawning {processes:,} workers 🧑‍🏭 to process {len(work):,} dataset fragments 📋")
 
+        # Make a pretty progress bar: about numTicks ticks, one every tick_step results
         numTicks = 33
-        if (int(len(work) / numTicks) == 0):
-            numTicks = int(len(work) / 0.25)
+        tick_step = max(1, len(work) // numTicks)
+        next_tick = tick_step
 
-        # Make a pretty progress bar
-        ticks = [n for n in range(1, len(work), numTicks)] + [len(work)]
-        ticks.reverse()
+        # Hand fragments to workers in chunks (about four per worker) so a dataset
+        # of many small fragments doesn't pay one pipe round trip per fragment
+        chunksize = max(1, len(work) // max(1, processes * 4))
 
-        mp.set_start_method("fork")
+        # forkserver children start from a clean server process rather than a copy of
+        # this one (its threads, loaded dataset metadata); the client reaches each
+        # worker once, pickled as its initializer argument
+        mp.set_start_method("forkserver", force=True)
         with mp.Pool(processes=processes, initializer=_initializer,
                      initargs=[client]) as pool:
 
             # The main processing loop
             log("⚙️ Loading: [", newline=False)
             start = time.time()
-            for result in pool.imap_unordered(worker, work):
+            for result in pool.imap_unordered(worker, work, chunksize=chunksize):
                 results.append(result)
-                if ticks and len(results) == ticks[-1]:
+                if len(results) >= next_tick:
                     log("➶", newline=False)
-                    ticks.pop()
+                    next_tick += tick_step
             log("]\n", newline=False)
             delta = time.time() - start
         log(f"🏁 Completed in {round(delta, 2)}s")
@@ -317,4 +335,4 @@ if __name__ == "__main__":
     except Exception as e:
         log(f"⚠️ Error: {e}")
 
-    pickle.dump((results, delta), sys.stdout.buffer)
+    pickle.dump((results, delta), sys.stdout.buffer, protocol=_PICKLE_PROTOCOL)
@@ -1,12 +1,31 @@
 """
 Shared utilities for Neo4j operations.
 """
+import atexit
+import threading
+
 import neo4j
 
+# Drivers are shared per (url, user) so every caller reuses one connection pool
+_drivers = {}
+_drivers_lock = threading.Lock()
+
+# Optional 'neo4j' config keys passed straight through to the driver
+_DRIVER_SETTINGS = (
+    "max_connection_pool_size",
+    "connection_acquisition_timeout",
+    "connection_timeout",
+    "keep_alive",
+)
+
 
 def get_driver(config: dict):
     """
-    Create a Neo4j driver from configuration.
+    Get the shared Neo4j driver for a configuration.
+    
+    The first call for a given url and user creates the driver; later calls
+    return the same instance so its connection pool stays warm. Callers must
+    not close it - all drivers are closed at interpreter exit (see close_drivers).
     
     Args:
         config: Configuration dictionary with 'neo4j' section containing:
@@ -14,13 +33,35 @@ def get_driver(config: dict):
             - bolt_port: Bolt port (default 7687)
             - user: Username
             - password: Password
+            - max_connection_pool_size, connection_acquisition_timeout,
+              connection_timeout, keep_alive: Optional connection pool tuning
+              passed to the driver (driver defaults apply when unset)
     
     Returns:
         Neo4j driver instance
     """
     neo4j_url = f"bolt://{config['neo4j']['host']}:{config['neo4j']['bolt_port']}"
-    return neo4j.GraphDatabase.driver(
-        neo4j_url,
-        auth=neo4j.basic_auth(config['neo4j']['user'], config['neo4j']['password'])
-    )
+    key = (neo4j_url, config['neo4j']['user'])
+    with _drivers_lock:
+        driver = _drivers.get(key)
+        if driver is None:
+            pool_settings = {k: config['neo4j'][k] for k in _DRIVER_SETTINGS if k in config['neo4j']}
+            driver = neo4j.GraphDatabase.driver(
+                neo4j_url,
+                auth=neo4j.basic_auth(config['neo4j']['user'], config['neo4j']['password']),
+                **pool_settings
+            )
+            _drivers[key] = driver
+        return driver
+
+
+def close_drivers():
+    """Close and forget every driver handed out by get_driver."""
+    with _drivers_lock:
+        drivers = list(_drivers.values())
+        _drivers.clear()
+    for driver in drivers:
+        driver.close()
+
 
+atexit.register(close_drivers)
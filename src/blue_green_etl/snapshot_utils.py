@@ -0,0 +1,20 @@
+"""
+Shared helpers for finding snapshot directories on disk.
+
+Snapshots live at <base_path>/<customer_id>/<timestamp>/{nodes,relationships}.
+"""
+import os
+
+
+def is_timestamp(text: str) -> bool:
+    """True if text is all ASCII digits, i.e. int() will accept it; cheaper than try/except on rejects."""
+    return text.isascii() and text.isdigit()
+
+
+def has_entries(path: str | os.PathLike) -> bool:
+    """True if path is a directory with at least one entry; stops at the first one."""
+    try:
+        with os.scandir(path) as entries:
+            return next(entries, None) is not None
+    except (FileNotFoundError, NotADirectoryError):
+        return False
@@ -1,7 +1,9 @@
 """
 Pytest configuration and shared fixtures.
 """
+import shutil
 import sys
+import tempfile
 from pathlib import Path
 import pytest
 from unittest.mock import Mock, MagicMock
@@ -14,6 +16,32 @@ if str(src_path) not in sys.path:
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
+from blue_green_etl import logging_config
+from blue_green_etl.neo4j_utils import close_drivers
+
+
+def pytest_configure(config):
+    """Send default-location log files to a temp dir, not the source tree.
+    
+    Scripts call setup_logging() when imported, which happens while tests are
+    collected, so this has to be in place before any fixture runs.
+    """
+    config._log_dir = Path(tempfile.mkdtemp(prefix="blue_green_etl_logs_"))
+    logging_config._DEFAULT_LOG_DIR = config._log_dir
+
+
+def pytest_unconfigure(config):
+    """Finish writing the log file and remove the temp log dir."""
+    logging_config.shutdown_logging()
+    shutil.rmtree(config._log_dir, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_drivers():
+    """Don't let a driver cached by one test leak into the next."""
+    yield
+    close_drivers()
+
 
 @pytest.fixture
 def mock_config():
@@ -0,0 +1,102 @@
+"""
+Tests for config_loader module.
+"""
+import os
+import pytest
+from unittest.mock import patch
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from blue_green_etl import config_loader
+from blue_green_etl.config_loader import load_config, resolve_data_base_path
+
+
+@pytest.fixture(autouse=True)
+def clear_config_cache():
+    """Start every test with empty read and parse caches."""
+    config_loader._read_config_cached.cache_clear()
+    config_loader._parse_config_cached.cache_clear()
+    yield
+    config_loader._read_config_cached.cache_clear()
+    config_loader._parse_config_cached.cache_clear()
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    """Write a minimal config file."""
+    path = tmp_path / "config.yaml"
+    path.write_text("neo4j:\n  host: localhost\n  password: secret\n")
+    return path
+
+
+class TestLoadConfig:
+    """Test load_config parsing and caching."""
+    
+    def test_load_config_parses_file(self, config_file):
+        """Test that the YAML file is parsed into a dictionary."""
+        config = load_config(config_file)
+        assert config == {"neo4j": {"host": "localhost", "password": "secret"}}
+    
+    def test_load_config_missing_file(self, tmp_path):
+        """Test that a missing file raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            load_config(tmp_path / "missing.yaml")
+    
+    def test_load_config_substitutes_env_vars(self, tmp_path):
+        """Test ${VAR} and ${VAR:default} substitution."""
+        path = tmp_path / "config.yaml"
+        path.write_text("neo4j:\n  host: ${TEST_NEO4J_HOST}\n  user: ${TEST_NEO4J_USER:neo4j}\n  password: x\n")
+        with patch.dict(os.environ, {"TEST_NEO4J_HOST": "db.example.com"}):
+            config = load_config(path)
+        assert config["neo4j"]["host"] == "db.example.com"
+        assert config["neo4j"]["user"] == "neo4j"
+    
+    def test_load_config_parses_once(self, config_file):
+        """Test that repeated loads of an unchanged file reuse the parsed result."""
+        with patch("blue_green_etl.config_loader.yaml.load", wraps=config_loader.yaml.load) as mock_load:
+            load_config(config_file)
+            load_config(config_file)
+            assert mock_load.call_count == 1
+    
+    def test_load_config_picks_up_env_changes(self, tmp_path):
+        """Test that a changed environment variable is used even though the file is unchanged."""
+        path = tmp_path / "config.yaml"
+        path.write_text("neo4j:\n  host: ${TEST_NEO4J_HOST}\n  password: ''\n")
+        with patch.dict(os.environ, {"TEST_NEO4J_HOST": "first", "NEO4J_PASSWORD": "one"}):
+            first = load_config(path)
+        with patch.dict(os.environ, {"TEST_NEO4J_HOST": "second", "NEO4J_PASSWORD": "two"}):
+            second = load_config(path)
+        assert first["neo4j"] == {"host": "first", "password": "one"}
+        assert second["neo4j"] == {"host": "second", "password": "two"}
+    
+    def test_load_config_returns_independent_copies(self, config_file):
+        """Test that modifying a returned config doesn't affect later loads."""
+        first = load_config(config_file)
+        first["neo4j"]["host"] = "changed"
+        assert load_config(config_file)["neo4j"]["host"] == "localhost"
+    
+    def test_load_config_reloads_after_edit(self, config_file):
+        """Test that a changed modification time invalidates the cache."""
+        load_config(config_file)
+        config_file.write_text("neo4j:\n  host: otherhost\n  password: secret\n")
+        stat = config_file.stat()
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert load_config(config_file)["neo4j"]["host"] == "otherhost"
+
+
+class TestResolveDataBasePath:
+    """Test resolve_data_base_path."""
+    
+    def test_relative_path_joins_base_dir(self, tmp_path):
+        """Test that a relative base_path is joined onto the given directory."""
+        config = {'dataset': {'base_path': 'data'}}
+        assert resolve_data_base_path(config, tmp_path) == tmp_path / "data"
+    
+    def test_absolute_path_used_as_is(self, tmp_path):
+        """Test that an absolute base_path is used as-is."""
+        config = {'dataset': {'base_path': str(tmp_path / "elsewhere")}}
+        assert resolve_data_base_path(config, Path("/unused")) == tmp_path / "elsewhere"
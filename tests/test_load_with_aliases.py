@@ -11,7 +11,7 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root / "src"))
 sys.path.insert(0, str(project_root))
 
-from scripts.load_with_aliases import load_database, set_alias
+from scripts.load_with_aliases import load_database, set_alias, set_aliases_bulk, _wait_dropped
 from blue_green_etl.neo4j_utils import get_driver
 
 
@@ -63,9 +63,7 @@ class TestLoadDatabase:
         # Mock Neo4j driver
         mock_driver = Mock()
         mock_session = Mock()
-        mock_result = Mock()
-        mock_result.single.return_value = None  # Database doesn't exist
-        mock_session.run.return_value = mock_result
+        mock_session.execute_write.return_value = ([], False)  # Database doesn't exist
         mock_driver.session.return_value.__enter__ = Mock(return_value=mock_session)
         mock_driver.session.return_value.__exit__ = Mock(return_value=None)
         
@@ -85,6 +83,8 @@ class TestLoadDatabase:
                     assert result['node_count'] == 100
                     assert result['relationship_count'] == 200
                     
+                    # Nothing was dropped, so there's nothing to wait for
+                    mock_session.run.assert_not_called()
                     # Verify database was created
                     mock_client.create_database.assert_called_once()
                     # Verify nodes and edges were processed
@@ -97,17 +97,22 @@ class TestLoadDatabase:
         timestamp = 1234567890
         db_name = f"{customer_id}-{timestamp}"
         
-        # Mock Neo4j driver - database exists
+        # Mock Neo4j driver - existing database is dropped in one write transaction
         mock_driver = Mock()
         mock_session = Mock()
-        mock_db_result = Mock()
-        mock_db_result.single.return_value = {"name": db_name}  # Database exists
+        mock_tx = Mock()
         mock_alias_result = Mock()
         mock_alias_result.__iter__ = Mock(return_value=iter([]))  # No aliases
-        mock_session.run.side_effect = [
-            mock_db_result,  # SHOW DATABASES
-            mock_alias_result  # SHOW ALIASES
+        mock_drop_result = Mock()
+        mock_drop_result.consume.return_value.counters.system_updates = 1  # Database existed
+        mock_tx.run.side_effect = [
+            mock_alias_result,  # SHOW ALIASES
+            mock_drop_result  # DROP DATABASE
         ]
+        mock_session.execute_write.side_effect = lambda fn, *args: fn(mock_tx, *args)
+        mock_gone_result = Mock()
+        mock_gone_result.single.return_value = {"c": 0}  # Drop completed
+        mock_session.run.return_value = mock_gone_result
         mock_driver.session.return_value.__enter__ = Mock(return_value=mock_session)
         mock_driver.session.return_value.__exit__ = Mock(return_value=None)
         
@@ -124,8 +129,9 @@ class TestLoadDatabase:
                     with patch('time.sleep'):  # Speed up test
                         result = load_database(customer_id, timestamp, mock_config, mock_data_path)
                         
-                        # Verify database was dropped
-                        drop_calls = [call for call in mock_session.run.call_args_list 
+                        # Verify database was dropped inside the write transaction
+                        mock_session.execute_write.assert_called_once()
+                        drop_calls = [call for call in mock_tx.run.call_args_list 
                                      if 'DROP DATABASE' in str(call)]
                         assert len(drop_calls) > 0
     
@@ -138,20 +144,24 @@ class TestLoadDatabase:
         # Mock Neo4j driver - database exists with alias
         mock_driver = Mock()
         mock_session = Mock()
-        mock_db_result = Mock()
-        mock_db_result.single.return_value = {"name": db_name}
+        mock_tx = Mock()
         
         # Mock alias pointing to database
-        alias_record = {"name": "customer1", "database": db_name}
+        alias_record = {"name": "customer1"}
         mock_alias_result = Mock()
         mock_alias_result.__iter__ = Mock(return_value=iter([alias_record]))
         
-        mock_session.run.side_effect = [
-            mock_db_result,  # SHOW DATABASES
+        mock_drop_result = Mock()
+        mock_drop_result.consume.return_value.counters.system_updates = 1  # Database existed
+        mock_tx.run.side_effect = [
             mock_alias_result,  # SHOW ALIASES
             Mock(),  # DROP ALIAS
-            Mock()  # DROP DATABASE
+            mock_drop_result  # DROP DATABASE
         ]
+        mock_session.execute_write.side_effect = lambda fn, *args: fn(mock_tx, *args)
+        mock_gone_result = Mock()
+        mock_gone_result.single.return_value = {"c": 0}
+        mock_session.run.return_value = mock_gone_result
         mock_driver.session.return_value.__enter__ = Mock(return_value=mock_session)
         mock_driver.session.return_value.__exit__ = Mock(return_value=None)
         
@@ -169,9 +179,10 @@ class TestLoadDatabase:
                         result = load_database(customer_id, timestamp, mock_config, mock_data_path)
                         
                         # Verify alias was dropped
-                        drop_alias_calls = [call for call in mock_session.run.call_args_list 
+                        drop_alias_calls = [call for call in mock_tx.run.call_args_list 
                                           if 'DROP ALIAS' in str(call)]
-                        assert len(drop_alias_calls) > 0
+                        assert len(drop_alias_calls) == 1
+                        assert drop_alias_calls[0][1] == {"alias": "customer1"}
     
     def test_load_database_handles_abort_failure(self, mock_config, mock_data_path):
         """Test that abort failures are handled gracefully."""
@@ -181,9 +192,7 @@ class TestLoadDatabase:
         # Mock Neo4j driver
         mock_driver = Mock()
         mock_session = Mock()
-        mock_result = Mock()
-        mock_result.single.return_value = None
-        mock_session.run.return_value = mock_result
+        mock_session.execute_write.return_value = ([], False)
         mock_driver.session.return_value.__enter__ = Mock(return_value=mock_session)
         mock_driver.session.return_value.__exit__ = Mock(return_value=None)
         
@@ -225,6 +234,36 @@ class TestLoadDatabase:
                     assert result is not None
 
 
+class TestWaitDropped:
+    """Test _wait_dropped() polling."""
+    
+    def _count_result(self, count):
+        result = Mock()
+        result.single.return_value = {"c": count}
+        return result
+    
+    def test_returns_once_database_gone(self):
+        """Test that polling stops as soon as the database is no longer listed."""
+        mock_session = Mock()
+        mock_session.run.side_effect = [self._count_result(1), self._count_result(0)]
+        
+        with patch('scripts.load_with_aliases.time.sleep') as mock_sleep:
+            assert _wait_dropped(mock_session, "customer1-1234567890") is True
+        
+        assert mock_session.run.call_count == 2
+        mock_sleep.assert_called_once()
+        # Database name is passed as a parameter, not interpolated
+        assert mock_session.run.call_args[1] == {"n": "customer1-1234567890"}
+    
+    def test_gives_up_after_timeout(self):
+        """Test that polling returns False if the database never disappears."""
+        mock_session = Mock()
+        mock_session.run.return_value = self._count_result(1)
+        
+        with patch('scripts.load_with_aliases.time.sleep'):
+            assert _wait_dropped(mock_session, "customer1-1234567890", timeout=0) is False
+
+
 class TestSetAlias:
     """Test set_alias() function."""
     
@@ -249,10 +288,11 @@ class TestSetAlias:
         mock_driver = Mock()
         mock_session = Mock()
         mock_session.run.return_value = None  # CREATE ALIAS succeeds
+        mock_session.execute_write.side_effect = lambda fn, *args: fn(mock_session, *args)
         mock_driver.session.return_value.__enter__ = Mock(return_value=mock_session)
         mock_driver.session.return_value.__exit__ = Mock(return_value=None)
         
-        with patch('scripts.load_with_aliases.neo4j.GraphDatabase.driver', return_value=mock_driver):
+        with patch('scripts.load_with_aliases.get_driver', return_value=mock_driver):
             result = set_alias(alias_name, target_database, mock_config)
             
             assert result is True
@@ -267,17 +307,17 @@ class TestSetAlias:
         # Mock Neo4j driver - alias exists
         mock_driver = Mock()
         mock_session = Mock()
-        # DROP ALIAS may raise exception (alias doesn't exist), CREATE ALIAS succeeds
-        mock_session.run.side_effect = [None, None]  # DROP (may fail), CREATE
+        mock_session.run.side_effect = [None]  # CREATE OR REPLACE
+        mock_session.execute_write.side_effect = lambda fn, *args: fn(mock_session, *args)
         mock_driver.session.return_value.__enter__ = Mock(return_value=mock_session)
         mock_driver.session.return_value.__exit__ = Mock(return_value=None)
         
-        with patch('scripts.load_with_aliases.neo4j.GraphDatabase.driver', return_value=mock_driver):
+        with patch('scripts.load_with_aliases.get_driver', return_value=mock_driver):
             result = set_alias(alias_name, target_database, mock_config)
             
             assert result is True
-            # Verify multiple calls were made (drop, create)
-            assert mock_session.run.call_count >= 1
+            # A single statement both creates and repoints the alias
+            assert mock_session.run.call_count == 1
     
     def test_set_alias_handles_errors(self, mock_config):
         """Test that alias errors are handled gracefully."""
@@ -288,7 +328,7 @@ class TestSetAlias:
         mock_driver = Mock()
         mock_driver.session.side_effect = Exception("Connection failed")
         
-        with patch('scripts.load_with_aliases.neo4j.GraphDatabase.driver', return_value=mock_driver):
+        with patch('scripts.load_with_aliases.get_driver', return_value=mock_driver):
             result = set_alias(alias_name, target_database, mock_config)
             
             # Should return False on error
@@ -303,12 +343,28 @@ class TestSetAlias:
         mock_driver = Mock()
         mock_session = Mock()
         mock_session.run.side_effect = Exception("Database does not exist")
+        mock_session.execute_write.side_effect = lambda fn, *args: fn(mock_session, *args)
         mock_driver.session.return_value.__enter__ = Mock(return_value=mock_session)
         mock_driver.session.return_value.__exit__ = Mock(return_value=None)
         
-        with patch('scripts.load_with_aliases.neo4j.GraphDatabase.driver', return_value=mock_driver):
+        with patch('scripts.load_with_aliases.get_driver', return_value=mock_driver):
             result = set_alias(alias_name, target_database, mock_config)
             
             # Should return False on error
             assert result is False
-
+    
+    def test_set_aliases_bulk_uses_one_transaction(self):
+        """Test that several aliases are switched in a single write transaction."""
+        mock_session = Mock()
+        mock_tx = Mock()
+        mock_session.execute_write.side_effect = lambda fn, *args: fn(mock_tx, *args)
+        
+        mapping = {"customer1": "customer1-1767741427", "customer2": "customer2-1767741427"}
+        result = set_aliases_bulk(mapping, mock_session)
+        
+        assert result is True
+        mock_session.execute_write.assert_called_once()
+        # One CREATE OR REPLACE per alias
+        assert mock_tx.run.call_count == 2
+        assert "CREATE OR REPLACE ALIAS" in mock_tx.run.call_args_list[1][0][0]
+        assert mock_tx.run.call_args_list[1][1] == {"alias": "customer2", "target": "customer2-1767741427"}
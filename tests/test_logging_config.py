@@ -11,7 +11,7 @@ import sys
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from blue_green_etl.logging_config import setup_logging, get_logger
+from blue_green_etl.logging_config import setup_logging, get_logger, shutdown_logging
 
 
 class TestLoggingConfig:
@@ -24,6 +24,8 @@ class TestLoggingConfig:
         
         logger = get_logger("test")
         logger.info("Test message")
+        # File writes happen on the listener thread; drain it before reading
+        shutdown_logging()
         
         # Find the log file (it will have today's date and time)
         # Since we can't predict the exact time, we'll search for files matching the pattern
@@ -95,6 +97,7 @@ class TestLoggingConfig:
         # Setup again (simulating multiple calls)
         setup_logging(log_dir=log_dir, console=False)
         logger.info("Second message")
+        shutdown_logging()
         
         # Find the log file (search for files matching the pattern)
         log_files = list(log_dir.glob("blue_green_etl_*.log"))
@@ -106,3 +109,36 @@ class TestLoggingConfig:
         assert "Second message" in content
         # Should have both messages
         assert content.count("message") == 2
+    
+    def test_file_handler_batches_fsync(self, tmp_path, monkeypatch):
+        """Test that records are readable after flush but fsync runs only on interval and close."""
+        from blue_green_etl import logging_config
+        
+        fsyncs = []
+        monkeypatch.setattr(logging_config.os, "fsync", fsyncs.append)
+        
+        log_file = tmp_path / "handler.log"
+        handler = logging_config.FlushingFileHandler(log_file)
+        for i in range(100):
+            handler.emit(logging.makeLogRecord({"msg": f"record {i}"}))
+        handler.flush()
+        
+        assert log_file.read_text().count("record") == 100
+        assert fsyncs == []
+        
+        handler.close()
+        assert len(fsyncs) == 1
+    
+    def test_log_file_created_on_first_record(self, tmp_path):
+        """Test that no log directory or file is created until something is logged."""
+        log_dir = tmp_path / "logs"
+        setup_logging(log_dir=log_dir, console=False)
+        shutdown_logging()
+        
+        assert not log_dir.exists()
+        
+        setup_logging(log_dir=log_dir, console=False)
+        get_logger("test").info("First record")
+        shutdown_logging()
+        
+        assert len(list(log_dir.glob("blue_green_etl_*.log"))) == 1
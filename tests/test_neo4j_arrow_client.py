@@ -1,6 +1,7 @@
 """
 Tests for neo4j_arrow_client module, focusing on error handling.
 """
+import json
 import pytest
 from unittest.mock import Mock, MagicMock, patch, call
 import sys
@@ -12,6 +13,7 @@ sys.path.insert(0, str(project_root))
 
 from blue_green_etl import neo4j_arrow_client as na
 from blue_green_etl import neo4j_arrow_error as error
+import pyarrow as pa
 from pyarrow.flight import FlightServerError
 
 
@@ -202,3 +204,244 @@ class TestNeo4jArrowClientSendAction:
         result = client._send_action("ABORT", {"name": "test-db"})
         
         assert result == {"name": "test-db", "status": "ok"}
+
+
+class TestNeo4jArrowClientWriteBatches:
+    """Test the _write_batches() method."""
+    
+    @staticmethod
+    def _batches(count, rows=10):
+        return [pa.RecordBatch.from_pydict({"id": list(range(i * rows, (i + 1) * rows))}) for i in range(count)]
+    
+    @patch('blue_green_etl.neo4j_arrow_client.Neo4jArrowClient._client')
+    def test_write_batches_coalesces_small_batches(self, mock_client):
+        """Test that small batches are sent as one combined batch."""
+        client = na.Neo4jArrowClient(
+            host='localhost',
+            port=8491,
+            user='neo4j',
+            password='test',
+            database='test-db'
+        )
+        writer = MagicMock()
+        mock_client.return_value.do_put.return_value = (writer, MagicMock())
+        
+        rows, _ = client._write_batches(client._upload_descriptor("node"), self._batches(5), lambda b: b)
+        
+        assert rows == 50
+        writer.write_batch.assert_not_called()
+        writer.write_table.assert_called_once()
+        table = writer.write_table.call_args[0][0]
+        assert table.num_rows == 50
+        assert table.column("id").num_chunks == 1
+    
+    @patch('blue_green_etl.neo4j_arrow_client.Neo4jArrowClient._client')
+    def test_write_batches_flushes_at_target_bytes(self, mock_client):
+        """Test that a batch at least target_bytes in size is sent on its own."""
+        client = na.Neo4jArrowClient(
+            host='localhost',
+            port=8491,
+            user='neo4j',
+            password='test',
+            database='test-db'
+        )
+        writer = MagicMock()
+        mock_client.return_value.do_put.return_value = (writer, MagicMock())
+        
+        rows, _ = client._write_batches(client._upload_descriptor("node"), self._batches(3), lambda b: b, target_bytes=1)
+        
+        assert rows == 30
+        assert writer.write_batch.call_count == 3
+        writer.write_table.assert_not_called()
+    
+    @patch('blue_green_etl.neo4j_arrow_client.Neo4jArrowClient._client')
+    def test_write_batches_counts_only_sent_batches(self, mock_client):
+        """Test that batches still buffered when a write fails are not counted."""
+        client = na.Neo4jArrowClient(
+            host='localhost',
+            port=8491,
+            user='neo4j',
+            password='test',
+            database='test-db'
+        )
+        writer = MagicMock()
+        writer.write_batch.side_effect = [None, Exception("stream closed")]
+        mock_client.return_value.do_put.return_value = (writer, MagicMock())
+        batches = self._batches(3)
+    
+        rows, nbytes = client._write_batches(client._upload_descriptor("node"), batches, lambda b: b, target_bytes=1)
+    
+        assert rows == 10
+        assert nbytes == batches[0].get_total_buffer_size()
+    
+    @patch('blue_green_etl.neo4j_arrow_client.Neo4jArrowClient._client')
+    def test_write_batches_without_mapping(self, mock_client):
+        """Test that batches are streamed unchanged when no mapping function is given."""
+        client = na.Neo4jArrowClient(
+            host='localhost',
+            port=8491,
+            user='neo4j',
+            password='test',
+            database='test-db'
+        )
+        writer = MagicMock()
+        mock_client.return_value.do_put.return_value = (writer, MagicMock())
+        
+        rows, _ = client._write_batches(client._upload_descriptor("node"), self._batches(2))
+        
+        assert rows == 20
+    
+    @patch('blue_green_etl.neo4j_arrow_client.Neo4jArrowClient._client')
+    def test_write_batches_accepts_empty_first_batch(self, mock_client):
+        """Test that a zero-row first batch is sent rather than treated as no input."""
+        client = na.Neo4jArrowClient(
+            host='localhost',
+            port=8491,
+            user='neo4j',
+            password='test',
+            database='test-db'
+        )
+        writer = MagicMock()
+        mock_client.return_value.do_put.return_value = (writer, MagicMock())
+        
+        rows, _ = client._write_batches(client._upload_descriptor("node"), self._batches(2, rows=0), lambda b: b)
+        
+        assert rows == 0
+        mock_client.return_value.do_put.assert_called_once()
+    
+    def test_write_batches_rejects_empty_iterable(self):
+        """Test that an empty iterable still raises."""
+        client = na.Neo4jArrowClient(
+            host='localhost',
+            port=8491,
+            user='neo4j',
+            password='test',
+            database='test-db'
+        )
+        
+        with pytest.raises(Exception, match="empty iterable"):
+            client._write_batches(client._upload_descriptor("node"), [], lambda b: b)
+    
+    def test_upload_descriptor_reused(self):
+        """Test that each upload descriptor is encoded once."""
+        client = na.Neo4jArrowClient(
+            host='localhost',
+            port=8491,
+            user='neo4j',
+            password='test',
+            database='test-db'
+        )
+        
+        descriptor = client._upload_descriptor("node")
+        
+        assert client._upload_descriptor("node") is descriptor
+        assert client._upload_descriptor("relationship") is not descriptor
+        assert json.loads(descriptor.command) == {"name": "test-db", "entity_type": "node"}
+
+
+class TestNeo4jArrowClientConnection:
+    """Test FlightClient reuse."""
+    
+    @patch('blue_green_etl.neo4j_arrow_client.flight.FlightClient')
+    def test_client_reused_until_closed(self, mock_flight_client):
+        """Test that _client() connects once and reconnects only after close()."""
+        client = na.Neo4jArrowClient(
+            host='localhost',
+            port=8491,
+            user='neo4j',
+            password='test',
+            database='test-db'
+        )
+        
+        first = client._client()
+        assert client._client() is first
+        assert mock_flight_client.call_count == 1
+        
+        client.close()
+        first.close.assert_called_once()
+        client._client()
+        assert mock_flight_client.call_count == 2
+    
+    def test_pickled_client_is_disconnected(self):
+        """Test that an unpickled copy starts without a connection."""
+        import pickle
+        client = na.Neo4jArrowClient(
+            host='localhost',
+            port=8491,
+            user='neo4j',
+            password='test',
+            database='test-db'
+        )
+        client.client = MagicMock()
+        
+        restored = pickle.loads(pickle.dumps(client))
+        
+        assert restored.client is None
+        assert restored.database == 'test-db'
+
+
+class TestAuthMiddleware:
+    """Test the Flight auth middleware headers."""
+    
+    def test_basic_header_without_token(self):
+        """Test that Basic auth is sent while there is no bearer token."""
+        import base64
+        factory = na.AuthFactory(("neo4j", "test"))
+        middleware = na.AuthMiddleware(factory)
+        
+        expected = "Basic " + base64.b64encode(b"neo4j:test").decode("ASCII")
+        assert middleware.sending_headers() == {"authorization": expected}
+    
+    def test_bearer_token_reused_until_expiry(self):
+        """Test that a received bearer token is sent until it is 10 minutes old."""
+        factory = na.AuthFactory(("neo4j", "test"))
+        middleware = na.AuthMiddleware(factory)
+        middleware.received_headers({"Authorization": "Bearer abc"})
+        
+        assert middleware.sending_headers() == {"authorization": "Bearer abc"}
+        
+        factory._token_timestamp -= 600
+        assert middleware.sending_headers()["authorization"].startswith("Basic ")
+
+
+class TestNeo4jArrowClientCreateDatabase:
+    """Test create_database() retries."""
+    
+    @patch('blue_green_etl.neo4j_arrow_client.time.sleep')
+    @patch('blue_green_etl.neo4j_arrow_client.Neo4jArrowClient._send_action')
+    def test_create_database_retries_with_backoff(self, mock_send_action, mock_sleep):
+        """Test that transient errors are retried with growing delays."""
+        mock_send_action.side_effect = [error.InternalError("busy")] * 3 + [{"name": "test-db"}]
+        client = na.Neo4jArrowClient(
+            host='localhost',
+            port=8491,
+            user='neo4j',
+            password='test',
+            database='test-db'
+        )
+        
+        assert client.create_database() == {"name": "test-db"}
+        
+        delays = [c.args[0] for c in mock_sleep.call_args_list]
+        assert len(delays) == 3
+        for attempt, slept in enumerate(delays):
+            assert 1.5 * 2 ** attempt <= slept < 4.5 * 2 ** attempt
+    
+    @patch('blue_green_etl.neo4j_arrow_client.time.sleep')
+    @patch('blue_green_etl.neo4j_arrow_client.Neo4jArrowClient._send_action')
+    def test_create_database_permanent_error_not_retried(self, mock_send_action, mock_sleep):
+        """Test that permanent errors are raised on the first attempt."""
+        mock_send_action.side_effect = error.InvalidArgument("bad config")
+        client = na.Neo4jArrowClient(
+            host='localhost',
+            port=8491,
+            user='neo4j',
+            password='test',
+            database='test-db'
+        )
+        
+        with pytest.raises(error.InvalidArgument):
+            client.create_database()
+        
+        assert mock_send_action.call_count == 1
+        mock_sleep.assert_not_called()
@@ -0,0 +1,143 @@
+"""
+Tests for neo4j_pq module, focusing on the per-batch column mapping.
+"""
+import pytest
+from unittest.mock import MagicMock
+import sys
+from pathlib import Path
+
+import pyarrow as pa
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from blue_green_etl import neo4j_pq as npq
+
+
+@pytest.fixture
+def worker_client():
+    """Install a mock Arrow client as the worker's client and hand it back."""
+    client = MagicMock()
+    npq._initializer(client)
+    yield client
+    npq._initializer(None)
+
+
+def _mapped(write_method, batch):
+    """Run the mapping function the processor handed to the client on batch."""
+    _, mappingfn = write_method.call_args[0]
+    return mappingfn(batch)
+
+
+class TestProcessNodes:
+    """Test the node batch mapping."""
+
+    def test_nodes_renamed_and_labels_split(self, worker_client):
+        """Test that id/labels are renamed and comma-separated labels become lists."""
+        batch = pa.RecordBatch.from_pydict({
+            "id": ["n1", "n2"],
+            "labels": ["Person", "Person,Customer"],
+            "name": ["Ann", "Bob"],
+        })
+
+        npq._process_nodes(iter([batch]))
+        mapped = _mapped(worker_client.write_nodes, batch)
+
+        assert mapped.schema.names == ["nodeId", "labels", "name"]
+        assert mapped.schema.field("labels").type == pa.list_(pa.string())
+        assert mapped.column("labels").to_pylist() == [["Person"], ["Person", "Customer"]]
+        assert mapped.column("nodeId").to_pylist() == ["n1", "n2"]
+        assert mapped.column("name").to_pylist() == ["Ann", "Bob"]
+
+    def test_node_schema_built_once_per_schema(self, worker_client, monkeypatch):
+        """Test that the target schema is reused across batches with the same schema."""
+        calls = []
+        node_schema = npq._node_schema
+        monkeypatch.setattr(npq, "_node_schema", lambda schema: calls.append(schema) or node_schema(schema))
+        batches = [
+            pa.RecordBatch.from_pydict({"id": [f"n{i}"], "labels": ["Person,Customer"]})
+            for i in range(3)
+        ]
+
+        npq._process_nodes(iter(batches))
+        _, mappingfn = worker_client.write_nodes.call_args[0]
+        mapped = [mappingfn(batch) for batch in batches]
+
+        assert len(calls) == 1
+        assert [m.column("labels").to_pylist() for m in mapped] == [[["Person", "Customer"]]] * 3
+
+    def test_list_labels_passed_through(self, worker_client):
+        """Test that labels already stored as list<string> are not split again."""
+        batch = pa.RecordBatch.from_pydict({
+            "id": ["n1"],
+            "labels": pa.array([["Person", "Customer"]], type=pa.list_(pa.string())),
+        })
+
+        npq._process_nodes(iter([batch]))
+        mapped = _mapped(worker_client.write_nodes, batch)
+
+        assert mapped.schema.names == ["nodeId", "labels"]
+        assert mapped.column("labels").to_pylist() == [["Person", "Customer"]]
+
+    def test_large_string_labels_split(self, worker_client):
+        """Test that large_string labels are split into list<string>."""
+        batch = pa.RecordBatch.from_pydict({
+            "id": ["n1"],
+            "labels": pa.array(["Person,Customer"], type=pa.large_string()),
+        })
+
+        npq._process_nodes(iter([batch]))
+        mapped = _mapped(worker_client.write_nodes, batch)
+
+        assert mapped.schema.field("labels").type == pa.list_(pa.string())
+        assert mapped.column("labels").to_pylist() == [["Person", "Customer"]]
+
+
+class TestProcessEdges:
+    """Test the relationship batch mapping."""
+
+    def test_edges_renamed(self, worker_client):
+        """Test that the first three columns get the names the Arrow service expects."""
+        batch = pa.RecordBatch.from_pydict({
+            "src": ["n1"],
+            "dst": ["n2"],
+            "type": ["KNOWS"],
+            "since": [2020],
+        })
+
+        npq._process_edges(iter([batch]))
+        mapped = _mapped(worker_client.write_edges, batch)
+
+        assert mapped.schema.names == ["sourceNodeId", "targetNodeId", "relationshipType", "since"]
+        assert mapped.column("since").to_pylist() == [2020]
+
+
+class TestWorker:
+    """Test the pool worker entry point."""
+
+    def test_worker_streams_each_fragment(self, worker_client, tmp_path):
+        """Test that every fragment's batches go to the client and the counts are summed."""
+        from pyarrow import parquet as pq
+        for i in range(2):
+            pq.write_table(pa.table({"id": [f"n{i}"], "labels": ["Person"]}), tmp_path / f"part-{i}.parquet")
+        fragments = pq.ParquetDataset(str(tmp_path)).fragments
+        worker_client.write_nodes.side_effect = lambda batches, fn: (sum(b.num_rows for b in batches), 8)
+
+        result = npq.worker([dict(key="node", fragment=f, table_size=10) for f in fragments])
+
+        assert worker_client.write_nodes.call_count == 2
+        assert result["rows"] == 2
+        assert result["bytes"] == 16
+
+    def test_worker_projects_columns(self, worker_client, tmp_path):
+        """Test that a task's columns limit what is read from the fragment."""
+        from pyarrow import parquet as pq
+        pq.write_table(pa.table({"id": ["n1"], "labels": ["Person"], "blob": ["x" * 100]}), tmp_path / "part.parquet")
+        fragment = pq.ParquetDataset(str(tmp_path)).fragments[0]
+        seen = []
+        worker_client.write_nodes.side_effect = lambda batches, fn: (seen.extend(batches), (1, 0))[1]
+
+        npq.worker(dict(key="node", fragment=fragment, table_size=10, columns=["id", "labels"]))
+
+        assert [b.schema.names for b in seen] == [["id", "labels"]]
@@ -11,7 +11,7 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from blue_green_etl.neo4j_utils import get_driver
+from blue_green_etl.neo4j_utils import get_driver, close_drivers
 
 
 class TestNeo4jUtils:
@@ -89,4 +89,58 @@ class TestNeo4jUtils:
         with patch('blue_green_etl.neo4j_utils.neo4j.GraphDatabase.driver', return_value=mock_driver_instance):
             result = get_driver(config)
             assert result is mock_driver_instance
-
+    
+    def test_get_driver_reuses_driver(self):
+        """Test that repeated calls with the same config share one driver."""
+        config = {
+            'neo4j': {
+                'host': 'localhost',
+                'bolt_port': 7687,
+                'user': 'neo4j',
+                'password': 'test'
+            }
+        }
+        
+        with patch('blue_green_etl.neo4j_utils.neo4j.GraphDatabase.driver') as mock_driver:
+            first = get_driver(config)
+            second = get_driver(dict(config))
+            
+            assert first is second
+            mock_driver.assert_called_once()
+    
+    def test_get_driver_passes_pool_settings(self):
+        """Test that optional pool settings in the neo4j section reach the driver."""
+        config = {
+            'neo4j': {
+                'host': 'localhost',
+                'bolt_port': 7687,
+                'user': 'neo4j',
+                'password': 'test',
+                'max_connection_pool_size': 20,
+                'connection_acquisition_timeout': 30
+            }
+        }
+        
+        with patch('blue_green_etl.neo4j_utils.neo4j.GraphDatabase.driver') as mock_driver:
+            get_driver(config)
+            
+            call_kwargs = mock_driver.call_args[1]
+            assert call_kwargs['max_connection_pool_size'] == 20
+            assert call_kwargs['connection_acquisition_timeout'] == 30
+    
+    def test_close_drivers_closes_and_forgets(self):
+        """Test that close_drivers closes cached drivers and a new one is created afterwards."""
+        config = {
+            'neo4j': {
+                'host': 'localhost',
+                'bolt_port': 7687,
+                'user': 'neo4j',
+                'password': 'test'
+            }
+        }
+        
+        with patch('blue_green_etl.neo4j_utils.neo4j.GraphDatabase.driver', side_effect=[Mock(), Mock()]):
+            first = get_driver(config)
+            close_drivers()
+            first.close.assert_called_once()
+            assert get_driver(config) is not first
@@ -71,43 +71,37 @@ class TestNeo4jHealthChecker:
         
         return Record(data_dict)
     
+    def _use_system_session(self, mock_driver, run):
+        """Route every query of the single system session through run(query)."""
+        mock_session = Mock()
+        mock_session.run.side_effect = lambda query, **kwargs: run(query)
+        mock_driver.session.return_value = self._create_session_context(mock_session)
+        return mock_session
+    
+    def _result(self, data_dict):
+        """Mock result whose single() returns a record built from data_dict."""
+        result = Mock()
+        result.single = Mock(return_value=self._create_record_mock(data_dict))
+        return result
+    
     def test_check_health_success(self, config, mock_driver):
         """Test successful health check."""
         with patch('scripts.orchestrator.get_driver', return_value=mock_driver):
             checker = Neo4jHealthChecker(config)
             
-            # Mock successful session - basic health check
-            mock_session = Mock()
-            mock_health_result = Mock()
-            health_record = self._create_record_mock({'health': 1})
-            mock_health_result.single = Mock(return_value=health_record)
-            mock_session.run.return_value = mock_health_result
-            
-            # Mock database count check - system session
-            # Note: The code calls self.driver.session(database="system").run(...) directly
-            # This means the context manager itself needs a .run() method
-            mock_system_context = Mock()
-            mock_db_result = Mock()
-            db_record = self._create_record_mock({'db_count': 10})
-            mock_db_result.single = Mock(return_value=db_record)
-            mock_system_context.run.return_value = mock_db_result
-            
-            # First call: default session (used in 'with' statement)
-            # Second call: system session (called directly with .run() on context manager)
-            def session_side_effect(database=None):
-                if database == "system":
-                    # Return a context manager that has a .run() method
-                    return mock_system_context
-                else:
-                    # Return a context manager that yields the default session
-                    return self._create_session_context(mock_session)
+            def run(query):
+                if 'SHOW DATABASES' in query:
+                    return self._result({'db_count': 10})
+                return self._result({'health': 1})
             
-            mock_driver.session.side_effect = session_side_effect
+            self._use_system_session(mock_driver, run)
             
             is_healthy, message = checker.check_health()
             
             assert is_healthy is True
             assert message == "Healthy"
+            # Ping, database count and JMX all share one system session
+            mock_driver.session.assert_called_once_with(database="system")
             checker.close()
     
     def test_check_health_too_many_databases(self, config, mock_driver):
@@ -115,26 +109,12 @@ class TestNeo4jHealthChecker:
         with patch('scripts.orchestrator.get_driver', return_value=mock_driver):
             checker = Neo4jHealthChecker(config)
             
-            # Mock successful basic check
-            mock_session = Mock()
-            mock_health_result = Mock()
-            mock_health_result.single.return_value = {'health': 1}
-            mock_session.run.return_value = mock_health_result
-            
-            # Mock database count check - too many databases
-            mock_system_context = Mock()
-            mock_db_result = Mock()
-            db_record = self._create_record_mock({'db_count': 60})  # Exceeds max of 50
-            mock_db_result.single = Mock(return_value=db_record)
-            mock_system_context.run.return_value = mock_db_result
-            
-            def session_side_effect(database=None):
-                if database == "system":
-                    return mock_system_context
-                else:
-                    return self._create_session_context(mock_session)
+            def run(query):
+                if 'SHOW DATABASES' in query:
+                    return self._result({'db_count': 60})  # Exceeds max of 50
+                return self._result({'health': 1})
             
-            mock_driver.session.side_effect = session_side_effect
+            self._use_system_session(mock_driver, run)
             
             is_healthy, message = checker.check_health()
             
@@ -147,53 +127,17 @@ class TestNeo4jHealthChecker:
         with patch('scripts.orchestrator.get_driver', return_value=mock_driver):
             checker = Neo4jHealthChecker(config)
             
-            # Mock successful basic check
-            mock_session = Mock()
-            mock_health_result = Mock()
-            health_record = self._create_record_mock({'health': 1})
-            mock_health_result.single = Mock(return_value=health_record)
-            mock_session.run = Mock(return_value=mock_health_result)
+            # Heap exactly at threshold: 85MB of 100MB
+            heap_data = {'used': 85000000, 'max': 100000000, 'committed': 100000000}
             
-            # Mock database count check - OK (below threshold)
-            # Use the same pattern as the working test
-            mock_system_context = Mock()
-            mock_db_result = Mock()
-            db_record = self._create_record_mock({'db_count': 10})
-            mock_db_result.single = Mock(return_value=db_record)
-            mock_system_context.run.return_value = mock_db_result
-            
-            # Mock heap memory check - too high (exactly at threshold)
-            # Note: _check_memory() creates its own system session with context manager
-            heap_data = {
-                'used': 85000000,  # 85MB (exactly 85% of 100MB)
-                'max': 100000000,  # 100MB max
-                'committed': 100000000
-            }
-            heap_record = self._create_record_mock(heap_data)
-            mock_heap_result = Mock()
-            mock_heap_result.single = Mock(return_value=heap_record)
-            
-            mock_memory_session = Mock()
-            mock_memory_session.run = Mock(return_value=mock_heap_result)
-            
-            # Track calls to session() - need to handle both direct .run() and context manager
-            # Use the same pattern as the working test
-            def session_side_effect(database=None):
-                if database == "system":
-                    # First call: direct .run() for db_count
-                    # Second call: context manager for _check_memory()
-                    # We need to track which call this is
-                    if not hasattr(session_side_effect, 'call_count'):
-                        session_side_effect.call_count = 0
-                    session_side_effect.call_count += 1
-                    if session_side_effect.call_count == 1:
-                        return mock_system_context
-                    else:
-                        return self._create_session_context(mock_memory_session)
-                else:
-                    return self._create_session_context(mock_session)
+            def run(query):
+                if 'SHOW DATABASES' in query:
+                    return self._result({'db_count': 10})
+                if 'queryJmx' in query:
+                    return self._result(heap_data)
+                return self._result({'health': 1})
             
-            mock_driver.session.side_effect = session_side_effect
+            self._use_system_session(mock_driver, run)
             
             is_healthy, message = checker.check_health()
             
@@ -206,46 +150,17 @@ class TestNeo4jHealthChecker:
         with patch('scripts.orchestrator.get_driver', return_value=mock_driver):
             checker = Neo4jHealthChecker(config)
             
-            # Mock successful basic check
-            mock_session = Mock()
-            mock_health_result = Mock()
-            mock_health_result.single.return_value = {'health': 1}
-            mock_session.run.return_value = mock_health_result
-            
-            # Mock database count check - OK
-            mock_system_session = Mock()
-            mock_db_result = Mock()
-            db_record = self._create_record_mock({'db_count': 10})
-            mock_db_result.single = Mock(return_value=db_record)
-            
-            # Mock heap memory check - OK (below threshold)
-            mock_heap_result = Mock()
-            heap_data = {
-                'used': 50000000,  # 50MB (50% of 100MB, below 85% threshold)
-                'max': 100000000,  # 100MB max
-                'committed': 100000000
-            }
-            heap_record = self._create_record_mock(heap_data)
-            mock_heap_result.single.return_value = heap_record
+            # 50% of 100MB, below 85% threshold
+            heap_data = {'used': 50000000, 'max': 100000000, 'committed': 100000000}
             
-            # First call returns db_count, second call returns heap
-            def system_session_run(query, **kwargs):
+            def run(query):
                 if 'SHOW DATABASES' in query:
-                    return mock_db_result
-                elif 'queryJmx' in query:
-                    return mock_heap_result
-                return mock_db_result
-            
-            mock_system_context = Mock()
-            mock_system_context.run.side_effect = system_session_run
+                    return self._result({'db_count': 10})
+                if 'queryJmx' in query:
+                    return self._result(heap_data)
+                return self._result({'health': 1})
             
-            def session_side_effect(database=None):
-                if database == "system":
-                    return mock_system_context
-                else:
-                    return self._create_session_context(mock_session)
-            
-            mock_driver.session.side_effect = session_side_effect
+            self._use_system_session(mock_driver, run)
             
             is_healthy, message = checker.check_health()
             
@@ -257,36 +172,14 @@ class TestNeo4jHealthChecker:
         with patch('scripts.orchestrator.get_driver', return_value=mock_driver):
             checker = Neo4jHealthChecker(config)
             
-            # Mock successful basic check
-            mock_session = Mock()
-            mock_health_result = Mock()
-            mock_health_result.single.return_value = {'health': 1}
-            mock_session.run.return_value = mock_health_result
-            
-            # Mock database count check - OK
-            mock_system_session = Mock()
-            mock_db_result = Mock()
-            db_record = self._create_record_mock({'db_count': 10})
-            mock_db_result.single = Mock(return_value=db_record)
-            
-            # Mock JMX query failure (JMX not available)
-            def system_session_run(query, **kwargs):
+            def run(query):
                 if 'SHOW DATABASES' in query:
-                    return mock_db_result
-                elif 'queryJmx' in query:
+                    return self._result({'db_count': 10})
+                if 'queryJmx' in query:
                     raise Exception("JMX not available")
-                return mock_db_result
-            
-            mock_system_context = Mock()
-            mock_system_context.run.side_effect = system_session_run
+                return self._result({'health': 1})
             
-            def session_side_effect(database=None):
-                if database == "system":
-                    return mock_system_context
-                else:
-                    return self._create_session_context(mock_session)
-            
-            mock_driver.session.side_effect = session_side_effect
+            self._use_system_session(mock_driver, run)
             
             # Should still pass (JMX not available is OK)
             is_healthy, message = checker.check_health()
@@ -307,4 +200,24 @@ class TestNeo4jHealthChecker:
             assert is_healthy is False
             assert "failed" in message.lower()
             checker.close()
+    
+    def test_check_health_result_is_cached(self, config, mock_driver):
+        """Test that a second check within the TTL reuses the first result."""
+        with patch('scripts.orchestrator.get_driver', return_value=mock_driver):
+            checker = Neo4jHealthChecker(config)
+            
+            with patch.object(checker, '_run_health_check', return_value=(True, "Healthy")) as mock_check:
+                assert checker.check_health() == (True, "Healthy")
+                assert checker.check_health() == (True, "Healthy")
+                assert mock_check.call_count == 1
+    
+    def test_check_health_rechecks_after_ttl(self, config, mock_driver):
+        """Test that an expired result is refreshed."""
+        config['orchestrator']['health_check_ttl'] = 0
+        with patch('scripts.orchestrator.get_driver', return_value=mock_driver):
+            checker = Neo4jHealthChecker(config)
+            
+            with patch.object(checker, '_run_health_check', side_effect=[(True, "Healthy"), (False, "Down")]):
+                assert checker.check_health() == (True, "Healthy")
+                assert checker.check_health() == (False, "Down")
 
@@ -5,8 +5,10 @@ import pytest
 from unittest.mock import Mock, patch, MagicMock, call
 from pathlib import Path
 from queue import Queue
-from threading import Event
+from threading import Event, Thread
 from datetime import datetime
+import json
+import signal
 import time
 
 import sys
@@ -15,6 +17,9 @@ sys.path.insert(0, str(project_root / "src"))
 sys.path.insert(0, str(project_root))
 
 from scripts.orchestrator import (
+    RetryScheduler,
+    SnapshotQueue,
+    OrchestratorSettings,
     OrchestratorStats,
     SnapshotTask,
     LoadWorker,
@@ -177,7 +182,7 @@ class TestLoadWorkerRetry:
     
     def test_retry_on_failure(self, mock_config, mock_health_checker, mock_stats):
         """Test that failed loads are retried."""
-        task_queue = Queue()
+        task_queue = SnapshotQueue()
         stop_event = Event()
         
         worker = LoadWorker(1, task_queue, mock_config, mock_health_checker, mock_stats)
@@ -203,12 +208,13 @@ class TestLoadWorkerRetry:
                 # Should record retry
                 assert mock_stats.tasks_retried == 1
                 
-                # Should schedule retry thread
-                assert mock_thread.called
+                # Should schedule the retry with the shared scheduler
+                assert len(worker.retry_scheduler) == 1
+                assert mock_thread.call_count == 1
     
     def test_max_retries_exceeded(self, mock_config, mock_health_checker, mock_stats):
         """Test that max retries are respected."""
-        task_queue = Queue()
+        task_queue = SnapshotQueue()
         stop_event = Event()
         
         worker = LoadWorker(1, task_queue, mock_config, mock_health_checker, mock_stats)
@@ -236,7 +242,7 @@ class TestLoadWorkerRetry:
     
     def test_exponential_backoff_calculation(self, mock_config, mock_health_checker, mock_stats):
         """Test exponential backoff delay calculation."""
-        task_queue = Queue()
+        task_queue = SnapshotQueue()
         stop_event = Event()
         
         worker = LoadWorker(1, task_queue, mock_config, mock_health_checker, mock_stats)
@@ -268,7 +274,7 @@ class TestLoadWorkerRetry:
     
     def test_retry_after_health_check_failure(self, mock_config, mock_health_checker, mock_stats):
         """Test retry after health check failure."""
-        task_queue = Queue()
+        task_queue = SnapshotQueue()
         stop_event = Event()
         
         worker = LoadWorker(1, task_queue, mock_config, mock_health_checker, mock_stats)
@@ -296,7 +302,7 @@ class TestLoadWorkerRetry:
     
     def test_successful_load_records_completion(self, mock_config, mock_health_checker, mock_stats):
         """Test that successful loads record completion."""
-        task_queue = Queue()
+        task_queue = SnapshotQueue()
         stop_event = Event()
         
         worker = LoadWorker(1, task_queue, mock_config, mock_health_checker, mock_stats)
@@ -311,7 +317,8 @@ class TestLoadWorkerRetry:
         # Mock successful load
         with patch('scripts.orchestrator.load_database', return_value={'node_count': 100, 'relationship_count': 200}):
             with patch('scripts.orchestrator.set_alias'):
-                with patch.object(worker, '_is_latest_deployment', return_value=True):
+                with patch.object(worker, '_load_db_snapshot', return_value=([], set())), \
+                     patch.object(worker, '_is_latest_deployment', return_value=True):
                     with patch.object(worker, '_cleanup_old_databases'):
                         result = worker.load_snapshot(task)
                         
@@ -321,6 +328,95 @@ class TestLoadWorkerRetry:
                         # Should record completion
                         assert mock_stats.tasks_completed == 1
 
+    def test_failed_alias_switch_is_retried(self, mock_config, mock_health_checker, mock_stats):
+        """Test that a failed alias switch is retried and not recorded as the latest deployment."""
+        worker = LoadWorker(1, SnapshotQueue(), mock_config, mock_health_checker, mock_stats)
+        task = SnapshotTask(
+            customer_id="customer1",
+            timestamp=1234567890,
+            data_path=Path("/tmp/data"),
+            created_at=datetime.now()
+        )
+
+        with patch('scripts.orchestrator.load_database', return_value={'node_count': 100, 'relationship_count': 200}), \
+             patch('scripts.orchestrator.set_alias', return_value=False), \
+             patch.object(worker, '_load_db_snapshot', return_value=([], set())), \
+             patch.object(worker, '_is_latest_deployment', return_value=True), \
+             patch.object(worker, '_cleanup_old_databases') as mock_cleanup, \
+             patch('scripts.orchestrator.Thread'):
+            result = worker.load_snapshot(task)
+
+        assert result is False
+        assert "customer1" not in worker.latest_deployments.timestamps
+        mock_cleanup.assert_not_called()
+        assert mock_stats.tasks_completed == 0
+        assert task.retry_count == 1
+        assert len(worker.retry_scheduler) == 1
+
+    
+    def test_worker_reuses_health_checker_driver(self, mock_config, mock_health_checker, mock_stats):
+        """Test that system queries go through the shared driver instead of a new one."""
+        def run(query, **params):
+            if query.startswith("SHOW ALIASES"):
+                return iter([{'database': 'customer1-100'}])
+            return iter([{'name': 'customer1-100'}, {'name': 'customer1-200'}])
+        
+        mock_session = Mock()
+        mock_session.run.side_effect = run
+        mock_health_checker.driver.session.return_value.__enter__ = Mock(return_value=mock_session)
+        mock_health_checker.driver.session.return_value.__exit__ = Mock(return_value=None)
+        
+        worker = LoadWorker(1, SnapshotQueue(), mock_config, mock_health_checker, mock_stats)
+        
+        with patch('scripts.orchestrator.get_driver') as mock_get_driver:
+            assert worker._is_latest_deployment("customer1", 200) is True
+            mock_get_driver.assert_not_called()
+        assert mock_health_checker.driver.session.call_args_list == [call(database="system")] * 2
+    
+    def test_db_snapshot_combines_databases_and_aliases(self, mock_config, mock_health_checker, mock_stats):
+        """Test that the snapshot pairs parsed databases with the aliased set."""
+        def run(query, **params):
+            if query.startswith("SHOW ALIASES"):
+                return iter([{'database': 'customer1-100'}])
+            return iter([{'name': 'customer1-100'}, {'name': 'customer1-eu'}])
+        
+        mock_session = Mock()
+        mock_session.run.side_effect = run
+        mock_health_checker.driver.session.return_value.__enter__ = Mock(return_value=mock_session)
+        mock_health_checker.driver.session.return_value.__exit__ = Mock(return_value=None)
+        
+        worker = LoadWorker(1, SnapshotQueue(), mock_config, mock_health_checker, mock_stats)
+        
+        assert worker._load_db_snapshot("customer1") == ([(100, 'customer1-100')], {'customer1-100'})
+
+    
+    def test_latest_deployment_tracked_in_process(self, mock_config, mock_health_checker, mock_stats):
+        """Test that only a customer's first check goes to the system database."""
+        worker = LoadWorker(1, SnapshotQueue(), mock_config, mock_health_checker, mock_stats)
+        
+        with patch.object(worker, '_load_db_snapshot', return_value=([(100, 'customer1-100')], set())) as mock_snapshot:
+            assert worker._is_latest_deployment("customer1", 100) is True
+            assert worker._is_latest_deployment("customer1", 50) is False
+            worker.latest_deployments.timestamps["customer1"] = 300
+            assert worker._is_latest_deployment("customer1", 200) is False
+            assert worker._is_latest_deployment("customer1", 400) is True
+        mock_snapshot.assert_called_once_with("customer1")
+    
+    def test_cleanup_keeps_newest_and_aliased(self, mock_config, mock_health_checker, mock_stats):
+        """Test that cleanup drops only old databases no alias points to."""
+        mock_session = Mock()
+        mock_health_checker.driver.session.return_value.__enter__ = Mock(return_value=mock_session)
+        mock_health_checker.driver.session.return_value.__exit__ = Mock(return_value=None)
+        
+        worker = LoadWorker(1, SnapshotQueue(), mock_config, mock_health_checker, mock_stats)
+        snapshot = (
+            [(100, 'customer1-100'), (400, 'customer1-400'), (200, 'customer1-200'), (300, 'customer1-300')],
+            {'customer1-200'}
+        )
+        worker._cleanup_old_databases('customer1', snapshot=snapshot)
+        
+        mock_session.run.assert_called_once_with("DROP DATABASE $name IF EXISTS", name='customer1-100')
+
 
 class TestSnapshotWatcher:
     """Test SnapshotWatcher class."""
@@ -434,6 +530,51 @@ class TestSnapshotWatcher:
         watcher.scan_for_snapshots()
         assert mock_stats.tasks_discovered == 1  # Still 1, not 2
     
+    def test_scan_ignores_snapshots_older_than_discovered(self, tmp_path, mock_stats):
+        """Test that a snapshot completing after a newer one was queued is skipped."""
+        task_queue = Queue()
+        stop_event = Event()
+        data_path = tmp_path / "data"
+        
+        def make_snapshot(timestamp, complete=True):
+            for sub in ("nodes", "relationships"):
+                path = data_path / "customer1" / str(timestamp) / sub
+                path.mkdir(parents=True)
+                if complete:
+                    (path / "data.parquet").touch()
+        
+        make_snapshot(1000, complete=False)
+        make_snapshot(2000)
+        
+        watcher = SnapshotWatcher(data_path, task_queue, stop_event, mock_stats)
+        watcher.scan_for_snapshots()
+        assert mock_stats.tasks_discovered == 1
+        assert watcher.latest_discovered == {"customer1": 2000}
+        
+        # The older snapshot finishing later is superseded, not loaded
+        for sub in ("nodes", "relationships"):
+            (data_path / "customer1" / "1000" / sub / "data.parquet").touch()
+        watcher.scan_for_snapshots()
+        assert mock_stats.tasks_discovered == 1
+
+    def test_scan_queues_every_complete_snapshot_oldest_first(self, tmp_path, mock_stats):
+        """Test that several complete snapshots found in one scan are all queued in order."""
+        task_queue = Queue()
+        stop_event = Event()
+        data_path = tmp_path / "data"
+        for timestamp in (3000, 1000, 2000):
+            for sub in ("nodes", "relationships"):
+                path = data_path / "customer1" / str(timestamp) / sub
+                path.mkdir(parents=True)
+                (path / "data.parquet").touch()
+    
+        watcher = SnapshotWatcher(data_path, task_queue, stop_event, mock_stats)
+        watcher.scan_for_snapshots()
+    
+        assert [task_queue.get().timestamp for _ in range(3)] == [1000, 2000, 3000]
+        assert task_queue.empty()
+        assert watcher.latest_discovered == {"customer1": 3000}
+    
     def test_scan_handles_missing_path(self, mock_stats):
         """Test that missing data path is handled gracefully."""
         task_queue = Queue()
@@ -602,3 +743,197 @@ orchestrator:
             with pytest.raises(ConnectionError, match="Failed to connect to Neo4j"):
                 Orchestrator(config_path)
 
+
+
+class TestOrchestratorSettings:
+    """Test OrchestratorSettings extraction from config."""
+    
+    def test_defaults_when_section_missing(self):
+        """Test that defaults apply when there is no orchestrator section."""
+        settings = OrchestratorSettings.from_config({})
+        assert settings.max_retries == 3
+        assert settings.retry_backoff_base == 2
+        assert settings.shutdown_timeout == 300
+    
+    def test_reads_known_keys_and_ignores_others(self):
+        """Test that configured values override defaults and unrelated keys are ignored."""
+        config = {'orchestrator': {'max_retries': 5, 'max_databases': 10, 'num_workers': 4}}
+        settings = OrchestratorSettings.from_config(config)
+        assert settings.max_retries == 5
+        assert settings.max_databases == 10
+        assert not hasattr(settings, 'num_workers')
+    
+    def test_worker_uses_shared_settings(self):
+        """Test that LoadWorker uses settings passed in rather than re-reading config."""
+        settings = OrchestratorSettings(max_retries=0)
+        worker = LoadWorker(1, SnapshotQueue(), {'orchestrator': {'max_retries': 3}}, Mock(), OrchestratorStats(), settings)
+        assert worker.settings is settings
+
+
+class TestSnapshotQueue:
+    """Test SnapshotQueue in-flight deduplication."""
+    
+    def _task(self, timestamp=100):
+        return SnapshotTask(
+            customer_id="customer1",
+            timestamp=timestamp,
+            data_path=Path("/tmp/data"),
+            created_at=datetime.now()
+        )
+    
+    def test_duplicate_snapshot_is_dropped(self):
+        """Test that a second task for an in-flight snapshot isn't queued."""
+        task_queue = SnapshotQueue()
+        task_queue.put(self._task())
+        task_queue.put(self._task())
+        task_queue.put(self._task(timestamp=200))
+        assert task_queue.qsize() == 2
+    
+    def test_same_task_can_be_requeued(self):
+        """Test that retries and health-check requeues of the same task go through."""
+        task_queue = SnapshotQueue()
+        task = self._task()
+        task_queue.put(task)
+        task_queue.put(task_queue.get())
+        assert task_queue.qsize() == 1
+    
+    def test_release_allows_snapshot_again(self):
+        """Test that a released snapshot can be queued by a new task."""
+        task_queue = SnapshotQueue()
+        task = self._task()
+        task_queue.put(task)
+        task_queue.get()
+        task_queue.release(task)
+        task_queue.put(self._task())
+        assert task_queue.qsize() == 1
+
+
+class TestRetryScheduler:
+    """Test RetryScheduler delayed re-queueing."""
+    
+    def test_requeues_in_due_order_on_one_thread(self):
+        """Test that retries come back in due-time order from a single thread."""
+        task_queue = Queue()
+        stop_event = Event()
+        scheduler = RetryScheduler(task_queue, stop_event)
+        
+        with patch('scripts.orchestrator.Thread', wraps=Thread) as mock_thread:
+            scheduler.schedule("later", 0.2)
+            scheduler.schedule("sooner", 0.05)
+            assert mock_thread.call_count == 1
+        
+        try:
+            assert task_queue.get(timeout=2) == "sooner"
+            assert task_queue.get(timeout=2) == "later"
+            assert len(scheduler) == 0
+        finally:
+            stop_event.set()
+
+
+class TestOrchestratorStop:
+    """Test Orchestrator shutdown waiting."""
+    
+    def _orchestrator(self, tmp_path, shutdown_timeout):
+        orchestrator = Orchestrator.__new__(Orchestrator)
+        orchestrator.task_queue = Queue()
+        orchestrator.stop_event = Event()
+        orchestrator.stats = OrchestratorStats()
+        orchestrator.status_file = tmp_path / "orchestrator_status.json"
+        orchestrator.settings = OrchestratorSettings(shutdown_timeout=shutdown_timeout)
+        return orchestrator
+    
+    def test_stop_returns_when_queue_drained(self, tmp_path):
+        """Test that stop returns as soon as all tasks are done."""
+        orchestrator = self._orchestrator(tmp_path, shutdown_timeout=5)
+        
+        start = time.monotonic()
+        with patch('scripts.orchestrator.close_drivers'):
+            orchestrator.stop()
+        assert time.monotonic() - start < 1
+    
+    def test_stop_gives_up_after_timeout(self, tmp_path):
+        """Test that stop doesn't wait past shutdown_timeout for unfinished tasks."""
+        orchestrator = self._orchestrator(tmp_path, shutdown_timeout=0.1)
+        orchestrator.task_queue.put("unfinished")
+        
+        start = time.monotonic()
+        with patch('scripts.orchestrator.close_drivers'):
+            orchestrator.stop()
+        assert time.monotonic() - start < 1
+
+    def test_stop_shuts_down_admin_query_pool(self, tmp_path):
+        """Test that stop shuts down the lazily created admin-query pool."""
+        import scripts.orchestrator as orchestrator_module
+        orchestrator = self._orchestrator(tmp_path, shutdown_timeout=5)
+        pool = orchestrator_module._get_admin_query_pool()
+        assert orchestrator_module._get_admin_query_pool() is pool
+
+        with patch('scripts.orchestrator.close_drivers'):
+            orchestrator.stop()
+
+        assert orchestrator_module._admin_query_pool is None
+        with pytest.raises(RuntimeError):
+            pool.submit(lambda: None)
+
+
+    def test_start_blocks_until_stop_requested(self, tmp_path):
+        """Test that start() waits on stop_event and then shuts down."""
+        orchestrator = self._orchestrator(tmp_path, shutdown_timeout=5)
+        orchestrator.data_base_path = tmp_path
+        orchestrator.num_workers = 0
+        orchestrator.scan_interval = 10
+        orchestrator.watcher = Mock()
+        orchestrator.workers = []
+        orchestrator._status_version = None
+        
+        with patch.object(Orchestrator, 'stop') as mock_stop, \
+             patch.object(Orchestrator, '_write_status_file'):
+            orchestrator._request_stop(signal.SIGTERM, None)
+            orchestrator.start()
+        
+        mock_stop.assert_called_once()
+        assert signal.getsignal(signal.SIGTERM) == signal.SIG_DFL
+
+
+class TestStatusFile:
+    """Test orchestrator status file writes."""
+    
+    def _orchestrator(self, tmp_path):
+        orchestrator = Orchestrator.__new__(Orchestrator)
+        orchestrator.task_queue = Queue()
+        orchestrator.stats = OrchestratorStats()
+        orchestrator.status_file = tmp_path / "orchestrator_status.json"
+        orchestrator._status_version = None
+        orchestrator.num_workers = 2
+        orchestrator.scan_interval = 10
+        orchestrator.data_base_path = tmp_path
+        return orchestrator
+    
+    def test_write_is_skipped_until_stats_change(self, tmp_path):
+        """Test that the status file is only rewritten when stats or queue size change."""
+        orchestrator = self._orchestrator(tmp_path)
+        
+        with patch('scripts.orchestrator._write_json_atomic') as mock_write:
+            orchestrator._write_status_file()
+            orchestrator._write_status_file()
+            assert mock_write.call_count == 1
+            
+            orchestrator.stats.record_discovery()
+            orchestrator._write_status_file()
+            assert mock_write.call_count == 2
+            
+            orchestrator.task_queue.put("task")
+            orchestrator._write_status_file()
+            assert mock_write.call_count == 3
+    
+    def test_write_replaces_file_atomically(self, tmp_path):
+        """Test that the status file is written via a temp file that doesn't linger."""
+        orchestrator = self._orchestrator(tmp_path)
+        orchestrator.stats.record_discovery()
+        
+        orchestrator._write_status_file()
+        
+        status = json.loads(orchestrator.status_file.read_text())
+        assert status['tasks_discovered'] == 1
+        assert status['workers'] == 2
+        assert list(tmp_path.glob("*.tmp")) == []
@@ -0,0 +1,45 @@
+"""
+Tests for snapshot_utils module.
+"""
+import pytest
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from blue_green_etl.snapshot_utils import has_entries, is_timestamp
+
+
+class TestIsTimestamp:
+    """Test is_timestamp."""
+
+    @pytest.mark.parametrize("text", ["0", "1767741427"])
+    def test_accepts_digits(self, text):
+        """Test that plain ASCII digit strings are accepted."""
+        assert is_timestamp(text)
+
+    @pytest.mark.parametrize("text", ["", "-1", "12a", "1.5", "١٢٣"])
+    def test_rejects_everything_else(self, text):
+        """Test that empty, signed, mixed and non-ASCII digit strings are rejected."""
+        assert not is_timestamp(text)
+
+
+class TestHasEntries:
+    """Test has_entries."""
+
+    def test_non_empty_directory(self, tmp_path):
+        """Test that a directory with a file has entries."""
+        (tmp_path / "part.parquet").touch()
+        assert has_entries(tmp_path)
+
+    def test_empty_directory(self, tmp_path):
+        """Test that an empty directory has no entries."""
+        assert not has_entries(tmp_path)
+
+    def test_missing_or_file_path(self, tmp_path):
+        """Test that a missing path or a plain file counts as no entries."""
+        (tmp_path / "file").touch()
+        assert not has_entries(tmp_path / "missing")
+        assert not has_entries(tmp_path / "file")